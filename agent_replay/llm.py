@@ -2,41 +2,111 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
+import itertools
 import logging
 import os
-import random
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
 
 import httpx
+import orjson
 
 log = logging.getLogger(__name__)
 
-# Persistent HTTP clients — lazily initialized, reused across calls
+# Persistent HTTP clients — lazily initialized, reused across calls so bursts
+# of viewer/narrator/reaction requests share pooled keep-alive connections
 _ollama_client: httpx.AsyncClient | None = None
 _openai_client: httpx.AsyncClient | None = None
 _anthropic_client: httpx.AsyncClient | None = None
 
+_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
 
 def _get_ollama_client() -> httpx.AsyncClient:
     global _ollama_client
     if _ollama_client is None or _ollama_client.is_closed:
-        _ollama_client = httpx.AsyncClient(timeout=60.0)
+        _ollama_client = httpx.AsyncClient(timeout=60.0, limits=_POOL_LIMITS)
     return _ollama_client
 
 
 def _get_openai_client() -> httpx.AsyncClient:
     global _openai_client
     if _openai_client is None or _openai_client.is_closed:
-        _openai_client = httpx.AsyncClient(timeout=30.0)
+        # HTTP/2 lets concurrent completions multiplex over one TLS connection
+        _openai_client = httpx.AsyncClient(timeout=30.0, limits=_POOL_LIMITS, http2=True)
     return _openai_client
 
 
 def _get_anthropic_client() -> httpx.AsyncClient:
     global _anthropic_client
     if _anthropic_client is None or _anthropic_client.is_closed:
-        _anthropic_client = httpx.AsyncClient(timeout=30.0)
+        _anthropic_client = httpx.AsyncClient(timeout=30.0, limits=_POOL_LIMITS, http2=True)
     return _anthropic_client
 
+
+async def aclose() -> None:
+    """Close the pooled HTTP clients (called on app shutdown)."""
+    global _ollama_client, _openai_client, _anthropic_client
+    for client in (_ollama_client, _openai_client, _anthropic_client):
+        if client is not None and not client.is_closed:
+            await client.aclose()
+    _ollama_client = _openai_client = _anthropic_client = None
+
+
+# Exact-match response cache: key -> (expires_at, messages). Idle or repetitive
+# agents produce the same context over and over; skip the round-trip for those.
+_response_cache: OrderedDict[bytes, tuple[float, list[str]]] = OrderedDict()
+_RESPONSE_CACHE_MAX = 256
+_RESPONSE_CACHE_TTL = 600.0  # seconds
+
+
+def _cache_key(system_prompt: str, user_input: str, count: int) -> bytes:
+    """Hash the provider, model, and prompt inputs into a compact cache key."""
+    if LLM_PROVIDER == "anthropic":
+        model = ANTHROPIC_MODEL
+    elif LLM_PROVIDER == "openai":
+        model = OPENAI_MODEL
+    else:
+        model = OLLAMA_MODEL
+    h = hashlib.blake2b(digest_size=16)
+    for part in (LLM_PROVIDER, model, system_prompt, user_input, str(count)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.digest()
+
+
+def _cache_get(key: bytes) -> list[str] | None:
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, messages = entry
+    if time.monotonic() >= expires_at:
+        del _response_cache[key]
+        return None
+    _response_cache.move_to_end(key)
+    return list(messages)
+
+
+def _cache_put(key: bytes, messages: list[str]) -> None:
+    if not messages:
+        return
+    _response_cache[key] = (time.monotonic() + _RESPONSE_CACHE_TTL, list(messages))
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > _RESPONSE_CACHE_MAX:
+        _response_cache.popitem(last=False)
+
+
+# Leading list numbering / bullets stripped from plain-text fallback lines
+_LIST_PREFIX = re.compile(r"^[\s0-9.\-)]+")
+
+# Caps on prompt inputs to bound input tokens. Context is trimmed from the
+# front since the most recent events are at the end.
+_MAX_CONTEXT_CHARS = 4000
+_MAX_EVENT_CONTENT_CHARS = 2000
+
 # Appended to Ollama user prompts to disable internal reasoning (Qwen3, Cogito).
 # Kept off for generate_interactive_reply where thinking improves quality.
 _NO_THINK = " /no_think"
@@ -47,30 +117,34 @@ STREAMER_NAMES = [
 ]
 
 
-def _random_streamer() -> str:
-    return random.choice(STREAMER_NAMES)
+# Rotating rather than random — plenty of variety without touching the RNG
+_streamer_cycle = itertools.cycle(STREAMER_NAMES)
 
 
-def _system_prompt() -> str:
-    name = _random_streamer()
-    return (
-        "You are a Twitch chat viewer watching a live AI coding stream. "
-        f"Generate short chat messages (under 20 words each) reacting to what {name} just did. "
-        "Be casual, use slang, emojis optional. You are a developer yourself. "
-        "Mix these tones:\n"
-        "- Reference SPECIFIC files, functions, or commands from the context "
-        "(e.g. \"server.py is getting thicc\", \"that grep tho\")\n"
-        "- Give backseat coding suggestions tied to what's actually happening "
-        "(e.g. \"add a try-catch around that fetch\", \"extract that into a helper\")\n"
-        "- Comment on code quality, patterns, or architecture choices "
-        "(e.g. \"nice separation of concerns\", \"watch the cyclomatic complexity\")\n"
-        "- React to errors, edits, or bash commands specifically\n"
-        "- Short hype reactions (max 2 of these)\n"
-        "IMPORTANT: At least 7 of your messages MUST reference specific files, "
-        "tools, code patterns, or commands from the context. Generic messages "
-        "like \"nice\" or \"W\" are okay for at most 2 of the messages.\n"
-        "Return a JSON array of strings, nothing else."
-    )
+def _random_streamer() -> str:
+    return next(_streamer_cycle)
+
+
+# Kept byte-identical across calls so provider prompt caching can hit on the
+# prefix — the streamer name and context go at the end of the user prompt
+SYSTEM_PROMPT_VIEWER = (
+    "You are a Twitch chat viewer watching a live AI coding stream. "
+    "Generate short chat messages (under 20 words each) reacting to what the streamer just did. "
+    "Be casual, use slang, emojis optional. You are a developer yourself. "
+    "Mix these tones:\n"
+    "- Reference SPECIFIC files, functions, or commands from the context "
+    "(e.g. \"server.py is getting thicc\", \"that grep tho\")\n"
+    "- Give backseat coding suggestions tied to what's actually happening "
+    "(e.g. \"add a try-catch around that fetch\", \"extract that into a helper\")\n"
+    "- Comment on code quality, patterns, or architecture choices "
+    "(e.g. \"nice separation of concerns\", \"watch the cyclomatic complexity\")\n"
+    "- React to errors, edits, or bash commands specifically\n"
+    "- Short hype reactions (max 2 of these)\n"
+    "IMPORTANT: At least 7 of your messages MUST reference specific files, "
+    "tools, code patterns, or commands from the context. Generic messages "
+    "like \"nice\" or \"W\" are okay for at most 2 of the messages.\n"
+    "Return a JSON array of strings, nothing else."
+)
 
 SYSTEM_PROMPT_EXPLAIN = (
     "You are a brief coding stream commentator. When asked about an AI agent's actions, "
@@ -105,6 +179,36 @@ ANTHROPIC_MODEL: str = os.environ.get("AGENTSTV_ANTHROPIC_MODEL", "claude-haiku-
 # Low-power mode — reduces batch sizes and adds delays between calls
 LOW_POWER: bool = os.environ.get("AGENTSTV_LOW_POWER", "").lower() in ("1", "true", "yes")
 
+_ANTHROPIC_URL = "https://api.anthropic.com/v1/messages"
+_OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+
+# Per-provider request pieces derived from the settings above — rebuilt in
+# configure() instead of on every call
+_ollama_chat_url: str = ""
+_ollama_payload: dict = {}
+_openai_headers: dict[str, str] = {}
+_openai_payload: dict = {}
+_anthropic_headers: dict[str, str] = {}
+_anthropic_payload: dict = {}
+
+
+def _refresh_request_templates() -> None:
+    global _ollama_chat_url, _ollama_payload, _openai_headers, _openai_payload
+    global _anthropic_headers, _anthropic_payload
+    _ollama_chat_url = f"{OLLAMA_URL}/api/chat"
+    _ollama_payload = {"model": OLLAMA_MODEL, "stream": True}
+    _openai_headers = {"Authorization": f"Bearer {OPENAI_KEY}"}
+    _openai_payload = {"model": OPENAI_MODEL, "temperature": 1.0}
+    _anthropic_headers = {
+        "x-api-key": ANTHROPIC_KEY,
+        "anthropic-version": "2023-06-01",
+        "content-type": "application/json",
+    }
+    _anthropic_payload = {"model": ANTHROPIC_MODEL}
+
+
+_refresh_request_templates()
+
 
 def configure(
     provider: str | None = None,
@@ -135,6 +239,7 @@ def configure(
         ANTHROPIC_MODEL = anthropic_model
     if low_power is not None:
         LOW_POWER = bool(low_power)
+    _refresh_request_templates()
 
 
 def is_ready() -> bool:
@@ -168,54 +273,48 @@ def get_settings() -> dict:
     }
 
 
-async def generate_viewer_messages(
+async def _generate_viewer_messages(
     context: str, count: int = 5
 ) -> tuple[list[str], str]:
-    """Generate viewer chat messages using the configured LLM provider.
-
-    Returns (messages, error_string).  error_string is empty on success.
-    """
-    if not is_ready():
-        return [], ""
-
     if LOW_POWER:
         count = min(count, 3)
+    context = context[-_MAX_CONTEXT_CHARS:]
 
     name = _random_streamer()
     user_prompt = (
-        f"Here are the last few things {name} did:\n{context}\n\n"
-        f"Generate {count} different short viewer chat messages reacting to this."
+        f"Generate {count} different short viewer chat messages reacting to this.\n\n"
+        f"Here are the last few things {name} did:\n{context}"
     )
-    system = _system_prompt()
+    system = SYSTEM_PROMPT_VIEWER
+
+    key = _cache_key(system, context, count)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached, ""
 
     try:
-        return await _dispatch(user_prompt, system, count=count), ""
+        messages = await _dispatch(user_prompt, system, count=count)
+        _cache_put(key, messages)
+        return messages, ""
     except Exception as exc:
         err = str(exc) or type(exc).__name__
         log.warning("LLM viewer-chat call failed: %s", err)
         return [], err
 
 
-async def generate_interactive_reply(
+async def _generate_interactive_reply(
     user_message: str,
     event_content: str,
     event_type: str,
     context: str,
 ) -> str:
-    """Generate a reply to a user question about agent activity.
-
-    Returns a string reply, or empty string on failure / LLM off.
-    """
-    if not is_ready():
-        return ""
-
     user_prompt = (
         f"The user is watching an AI coding agent and asked:\n\"{user_message}\"\n\n"
     )
     if event_content:
-        user_prompt += f"They're asking about this specific event ({event_type}):\n{event_content[:2000]}\n\n"
+        user_prompt += f"They're asking about this specific event ({event_type}):\n{event_content[:_MAX_EVENT_CONTENT_CHARS]}\n\n"
     if context:
-        user_prompt += f"Recent agent activity for context:\n{context}\n"
+        user_prompt += f"Recent agent activity for context:\n{context[-_MAX_CONTEXT_CHARS:]}\n"
 
     try:
         return await _dispatch(user_prompt, SYSTEM_PROMPT_EXPLAIN, raw=True)
@@ -224,50 +323,117 @@ async def generate_interactive_reply(
         return ""
 
 
-async def generate_narrator_messages(context: str, count: int = 3) -> list[str]:
-    """Generate narrator play-by-play messages using the configured LLM provider.
-
-    Returns a list of strings, or an empty list on failure.
-    """
-    if not is_ready():
-        return []
-
+async def _generate_narrator_messages(context: str, count: int = 3) -> list[str]:
     if LOW_POWER:
         count = min(count, 1)
+    context = context[-_MAX_CONTEXT_CHARS:]
 
     name = _random_streamer()
     user_prompt = (
-        f"Here is what {name} just did:\n{context}\n\n"
-        f"Generate {count} dramatic play-by-play commentary lines about this."
+        f"Generate {count} dramatic play-by-play commentary lines about this.\n\n"
+        f"Here is what {name} just did:\n{context}"
     )
 
+    key = _cache_key(SYSTEM_PROMPT_NARRATOR, context, count)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
     try:
-        return await _dispatch(user_prompt, SYSTEM_PROMPT_NARRATOR, count=count)
+        messages = await _dispatch(user_prompt, SYSTEM_PROMPT_NARRATOR, count=count)
+        _cache_put(key, messages)
+        return messages
     except Exception as exc:
         log.warning("Narrator LLM call failed: %s", str(exc) or type(exc).__name__)
         return []
 
 
-async def generate_viewer_reaction(user_message: str) -> list[str]:
-    """Generate 1-2 viewer reactions to a user's chat message.
-
-    Returns a list of strings, or an empty list on failure.
-    """
-    if not is_ready():
-        return []
-
+async def _generate_viewer_reaction(user_message: str) -> list[str]:
     user_prompt = (
         f"A chatter said: \"{user_message}\"\n\n"
         "Generate 1-2 casual viewer reactions."
     )
 
+    key = _cache_key(SYSTEM_PROMPT_REACT, user_message, 2)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
     try:
-        return await _dispatch(user_prompt, SYSTEM_PROMPT_REACT, count=2)
+        messages = await _dispatch(user_prompt, SYSTEM_PROMPT_REACT, count=2)
+        _cache_put(key, messages)
+        return messages
     except Exception as exc:
         log.warning("Viewer reaction LLM call failed: %s", str(exc) or type(exc).__name__)
         return []
 
 
+class _Immediate:
+    """Awaitable that completes synchronously — no coroutine or task is created."""
+
+    __slots__ = ("_make",)
+
+    def __init__(self, make) -> None:
+        self._make = make
+
+    def __await__(self):
+        return self._make()
+        yield  # unreachable; makes __await__ a generator
+
+
+_EMPTY_VIEWER = _Immediate(lambda: ([], ""))
+_EMPTY_TEXT = _Immediate(str)
+_EMPTY_LIST = _Immediate(list)
+
+# The public generators are plain functions: with the LLM off or unconfigured
+# they hand back a ready-made empty result, so callers awaiting them cost a
+# function call instead of a coroutine per request.
+
+
+def generate_viewer_messages(
+    context: str, count: int = 5
+) -> Awaitable[tuple[list[str], str]]:
+    """Generate viewer chat messages using the configured LLM provider.
+
+    Returns (messages, error_string).  error_string is empty on success.
+    """
+    if not is_ready():
+        return _EMPTY_VIEWER
+    return _generate_viewer_messages(context, count)
+
+
+def generate_interactive_reply(
+    user_message: str, event_content: str, event_type: str, context: str
+) -> Awaitable[str]:
+    """Generate a reply to a user question about agent activity.
+
+    Returns a string reply, or empty string on failure / LLM off.
+    """
+    if not is_ready():
+        return _EMPTY_TEXT
+    return _generate_interactive_reply(user_message, event_content, event_type, context)
+
+
+def generate_narrator_messages(context: str, count: int = 3) -> Awaitable[list[str]]:
+    """Generate narrator play-by-play messages using the configured LLM provider.
+
+    Returns a list of strings, or an empty list on failure.
+    """
+    if not is_ready():
+        return _EMPTY_LIST
+    return _generate_narrator_messages(context, count)
+
+
+def generate_viewer_reaction(user_message: str) -> Awaitable[list[str]]:
+    """Generate 1-2 viewer reactions to a user's chat message.
+
+    Returns a list of strings, or an empty list on failure.
+    """
+    if not is_ready():
+        return _EMPTY_LIST
+    return _generate_viewer_reaction(user_message)
+
+
 async def _dispatch(
     user_prompt: str,
     system_prompt: str = "",
@@ -292,24 +458,14 @@ async def _call_anthropic(
     count: int = 5,
     raw: bool = False,
 ) -> list[str] | str:
-    url = "https://api.anthropic.com/v1/messages"
-    headers = {
-        "x-api-key": ANTHROPIC_KEY,
-        "anthropic-version": "2023-06-01",
-        "content-type": "application/json",
-    }
-    payload = {
-        "model": ANTHROPIC_MODEL,
-        "max_tokens": 500 if raw else 300,
-        "system": system_prompt,
-        "messages": [
-            {"role": "user", "content": user_prompt},
-        ],
-    }
+    payload = _anthropic_payload.copy()
+    payload["max_tokens"] = 500 if raw else 300
+    payload["system"] = system_prompt
+    payload["messages"] = [{"role": "user", "content": user_prompt}]
     client = _get_anthropic_client()
-    resp = await client.post(url, json=payload, headers=headers)
+    resp = await client.post(_ANTHROPIC_URL, json=payload, headers=_anthropic_headers)
     resp.raise_for_status()
-    body = resp.json()
+    body = orjson.loads(resp.content)
     text = body["content"][0]["text"]
     if raw:
         return text.strip()
@@ -323,22 +479,37 @@ async def _call_ollama(
     count: int = 5,
     raw: bool = False,
 ) -> list[str] | str:
-    url = f"{OLLAMA_URL}/api/chat"
-    payload = {
-        "model": OLLAMA_MODEL,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "stream": False,
-    }
+    payload = _ollama_payload.copy()
+    payload["messages"] = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
     if not raw:
         payload["format"] = "json"
     client = _get_ollama_client()
-    resp = await client.post(url, json=payload)
-    resp.raise_for_status()
-    body = resp.json()
-    text = body["message"]["content"]
+    # Streamed as NDJSON chunks — collect message deltas as they arrive
+    # rather than waiting for one fully buffered response envelope
+    parts: list[str] = []
+    scanner = None if raw else _ArrayStringScanner()
+    messages: list[str] = []
+    async with client.stream("POST", _ollama_chat_url, json=payload) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            if chunk.get("error"):
+                raise RuntimeError(chunk["error"])
+            delta = chunk.get("message", {}).get("content", "")
+            parts.append(delta)
+            if scanner is not None:
+                messages.extend(scanner.feed(delta))
+                if len(messages) >= count:
+                    # Enough messages — closing the stream stops generation early
+                    return messages[:count]
+            if chunk.get("done"):
+                break
+    text = "".join(parts)
     if raw:
         return text.strip()
     return _parse_response(text, count)
@@ -351,32 +522,79 @@ async def _call_openai(
     count: int = 5,
     raw: bool = False,
 ) -> list[str] | str:
-    url = "https://api.openai.com/v1/chat/completions"
-    headers = {"Authorization": f"Bearer {OPENAI_KEY}"}
-    payload = {
-        "model": OPENAI_MODEL,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": 1.0,
-        "max_tokens": 300 if not raw else 500,
-    }
+    payload = _openai_payload.copy()
+    payload["messages"] = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+    payload["max_tokens"] = 300 if not raw else 500
     client = _get_openai_client()
-    resp = await client.post(url, json=payload, headers=headers)
+    resp = await client.post(_OPENAI_URL, json=payload, headers=_openai_headers)
     resp.raise_for_status()
-    body = resp.json()
+    body = orjson.loads(resp.content)
     text = body["choices"][0]["message"]["content"]
     if raw:
         return text.strip()
     return _parse_response(text, count)
 
 
+class _ArrayStringScanner:
+    """Incrementally extract completed string elements of JSON arrays.
+
+    Each streamed delta is scanned exactly once, so the total work is O(n)
+    over the stream instead of re-parsing the growing buffer per delta.
+    Handles both a bare ``[...]`` and arrays nested in an object such as
+    ``{"messages": [...]}``; strings that are object keys or values are
+    ignored.
+    """
+
+    __slots__ = ("_stack", "_in_string", "_escape", "_pieces")
+
+    def __init__(self) -> None:
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._pieces: list[str] = []
+
+    def feed(self, chunk: str) -> list[str]:
+        """Consume *chunk* and return any string elements it completed."""
+        out: list[str] = []
+        seg_start = 0
+        for i, ch in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._pieces.append(chunk[seg_start:i])
+                    raw = "".join(self._pieces)
+                    self._pieces = []
+                    if self._stack and self._stack[-1] == "[":
+                        try:
+                            value = orjson.loads(f'"{raw}"')
+                        except orjson.JSONDecodeError:
+                            continue
+                        if value:
+                            out.append(value)
+            elif ch == '"':
+                self._in_string = True
+                seg_start = i + 1
+            elif ch == "[" or ch == "{":
+                self._stack.append(ch)
+            elif (ch == "]" or ch == "}") and self._stack:
+                self._stack.pop()
+        if self._in_string:
+            self._pieces.append(chunk[seg_start:])
+        return out
+
+
 def _parse_response(text: str, count: int) -> list[str]:
     """Parse LLM response into a list of message strings."""
     text = text.strip()
     try:
-        data = json.loads(text)
+        data = orjson.loads(text)
         # Handle {"messages": [...]} or just [...]
         if isinstance(data, dict):
             for key in ("messages", "chat", "responses", "items"):
@@ -396,8 +614,9 @@ def _parse_response(text: str, count: int) -> list[str]:
                         return strings[:count]
         if isinstance(data, list):
             return [str(m) for m in data if m][:count]
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         pass
     # Fallback: split by newlines, strip numbering
-    lines = [ln.strip().lstrip("0123456789.-) ").strip('"\'') for ln in text.splitlines()]
+    lines = [_LIST_PREFIX.sub("", ln).rstrip().strip('"\'') for ln in text.splitlines()]
     return [ln for ln in lines if ln and len(ln) < 100][:count]
+
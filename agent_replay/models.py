@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+import orjson
+
 
 class EventType(str, Enum):
     SPAWN = "spawn"
@@ -23,14 +26,50 @@ class EventType(str, Enum):
     USER = "user"
 
 
+# Only this much of the content is whitespace-normalized up front; the
+# summary needs at most ~120 chars, so multi-KB tool output is never split
+# in full unless the head is almost entirely whitespace
+_SUMMARY_WINDOW = 1024
+
+# Only short content is memoized — caching multi-KB tool output would just
+# pin memory for strings that rarely repeat
+_SUMMARY_CACHE_MAX_INPUT = 256
+
+
 def _summarize(text: str, max_len: int = 120) -> str:
     """Create a 1-line summary from full content."""
+    # Already a clean one-liner: isprintable() rejects newlines, tabs and every
+    # other whitespace except a plain space, so only doubled/edge spaces remain
+    if (
+        len(text) <= max_len
+        and text.isprintable()
+        and "  " not in text
+        and not text.startswith(" ")
+        and not text.endswith(" ")
+    ):
+        return text
+    if len(text) < _SUMMARY_CACHE_MAX_INPUT:
+        return _summarize_cached(text, max_len)
+    return _summarize_text(text, max_len)
+
+
+def _summarize_text(text: str, max_len: int) -> str:
+    # Collapsing whitespace only shrinks text, so once the normalized head is
+    # longer than max_len its first max_len - 1 chars match the full result
+    if len(text) > _SUMMARY_WINDOW:
+        head = " ".join(text[:_SUMMARY_WINDOW].split())
+        if len(head) > max_len:
+            return head[: max_len - 1] + "\u2026"
     text = " ".join(text.split())
     if len(text) > max_len:
         return text[: max_len - 1] + "\u2026"
     return text
 
 
+_summarize_cached = functools.lru_cache(maxsize=4096)(_summarize_text)
+
+
+@functools.lru_cache(maxsize=4096)
 def _short_path(path: str) -> str:
     """Shorten a file path for display."""
     if not path:
@@ -42,7 +81,7 @@ def _short_path(path: str) -> str:
     return str(p.name) if len(parts) <= 1 else str(Path(*parts[-2:]))
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     timestamp: str
     type: EventType
@@ -53,6 +92,14 @@ class Event:
     output_tokens: int = 0
     cache_read_tokens: int = 0
     content: str = ""
+    # Derived display fields — computed once at construction rather than on
+    # every serialization, since parsed sessions are cached and re-sent often
+    short_path: str = field(init=False, default="")
+    summary: str = field(init=False, default="")
+
+    def __post_init__(self) -> None:
+        self.short_path = _short_path(self.file_path)
+        self.summary = _summarize(self.content)
 
     def to_dict(self) -> dict:
         return {
@@ -61,16 +108,16 @@ class Event:
             "agent_id": self.agent_id,
             "tool_name": self.tool_name,
             "file_path": self.file_path,
-            "short_path": _short_path(self.file_path),
+            "short_path": self.short_path,
             "input_tokens": self.input_tokens,
             "output_tokens": self.output_tokens,
             "cache_read_tokens": self.cache_read_tokens,
             "content": self.content,
-            "summary": _summarize(self.content),
+            "summary": self.summary,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Agent:
     id: str
     name: str
@@ -94,7 +141,7 @@ class Agent:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     id: str
     slug: str = ""
@@ -115,8 +162,16 @@ class Session:
             "events": [e.to_dict() for e in self.events],
         }
 
+    def to_json(self) -> bytes:
+        """Encode straight to JSON bytes, skipping the to_dict() intermediate.
+
+        orjson serializes the nested dataclasses and ``EventType`` values
+        natively, producing the same document as ``to_dict()``.
+        """
+        return orjson.dumps(self)
+
 
-@dataclass
+@dataclass(slots=True)
 class SessionSummary:
     id: str
     project_name: str
@@ -2,16 +2,49 @@
 
 from __future__ import annotations
 
+import dataclasses
+import itertools
 import json
+import os
+import threading
+import weakref
+from dataclasses import dataclass, field
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Iterator, Tuple
+
+import orjson
 
 from .models import Agent, Event, EventType, Session
 
-# Parse cache: keyed on (resolved_path, mtime) -> Session
-_parse_cache: Dict[Tuple[str, float], Session] = {}
+# Parse cache: resolved_path -> ((st_size, st_mtime_ns), Session), least
+# recently used first.  The size catches rewrites within one mtime tick.
+_parse_cache: Dict[str, Tuple[Tuple[int, int], Session]] = {}
 _PARSE_CACHE_MAX = 64
 
+# parse() runs on worker threads, several at once for the master channel;
+# guards cache eviction, which iterates the dicts
+_parse_cache_lock = threading.Lock()
+
+# One parse per file at a time: a caller that misses while another thread is
+# parsing the same file waits, then takes its result or resume point instead
+# of re-reading the whole transcript.  Entries live while a parse holds them.
+_path_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+
+# Resume points for Claude Code transcripts, keyed on resolved path; lets a
+# grown transcript be extended with just its appended records
+_resume_states: Dict[str, "_ClaudeResume"] = {}
+
+# Trailing bytes of the last complete line kept with each resume mark
+_MARK_TAIL = 64
+
+# Format markers appear in the first few records; don't scan further
+_DETECT_MAX_LINES = 50
+
+# Shared default for ``.get`` lookups on optional nested objects, so hot
+# loops don't build a fresh empty dict per record.  Never mutated.
+_EMPTY_DICT: dict = {}
+
 # Agent colors assigned round-robin to sub-agents
 AGENT_COLORS = ["magenta", "yellow", "green", "red", "blue", "white"]
 
@@ -29,6 +62,50 @@ TOOL_TYPE_MAP = {
 }
 
 
+# Per-tool extraction of (file_path, description) from a tool_use input
+def _tool_file(tool_input: dict) -> tuple[str, str]:
+    return tool_input.get("file_path", ""), ""
+
+
+def _tool_bash(tool_input: dict) -> tuple[str, str]:
+    return "", tool_input.get("description", "") or tool_input.get("command", "")
+
+
+def _tool_task(tool_input: dict) -> tuple[str, str]:
+    return "", tool_input.get("description", "")
+
+
+def _tool_pattern(tool_input: dict) -> tuple[str, str]:
+    return "", tool_input.get("pattern", "")
+
+
+def _tool_query(tool_input: dict) -> tuple[str, str]:
+    return "", tool_input.get("query", "")
+
+
+def _tool_url(tool_input: dict) -> tuple[str, str]:
+    return "", tool_input.get("url", "")
+
+
+def _tool_default(tool_input: dict) -> tuple[str, str]:
+    return "", str(tool_input)
+
+
+# Tool name -> (event type, input handler); one dict lookup per tool_use block
+_TOOL_HANDLERS = {
+    "Read": (TOOL_TYPE_MAP["Read"], _tool_file),
+    "Write": (TOOL_TYPE_MAP["Write"], _tool_file),
+    "Edit": (TOOL_TYPE_MAP["Edit"], _tool_file),
+    "Bash": (TOOL_TYPE_MAP["Bash"], _tool_bash),
+    "Task": (TOOL_TYPE_MAP["Task"], _tool_task),
+    "Glob": (TOOL_TYPE_MAP["Glob"], _tool_pattern),
+    "Grep": (TOOL_TYPE_MAP["Grep"], _tool_pattern),
+    "WebSearch": (TOOL_TYPE_MAP["WebSearch"], _tool_query),
+    "WebFetch": (TOOL_TYPE_MAP["WebFetch"], _tool_url),
+}
+_DEFAULT_TOOL_HANDLER = (EventType.TOOL_CALL, _tool_default)
+
+
 def auto_detect(file_path: str | Path) -> str:
     """Detect transcript format.
 
@@ -39,92 +116,154 @@ def auto_detect(file_path: str | Path) -> str:
     # Gemini CLI stores sessions as JSON (not JSONL) in ~/.gemini/
     if file_path.suffix == ".json":
         try:
-            with open(file_path, encoding="utf-8") as f:
-                data = json.load(f)
+            with open(file_path, "rb") as f:
+                data = orjson.loads(f.read())
             if isinstance(data, dict) and "messages" in data:
                 return "gemini"
             if isinstance(data, list) and data and isinstance(data[0], dict):
                 first = data[0]
                 if first.get("role") in ("user", "model"):
                     return "gemini"
-        except (json.JSONDecodeError, OSError):
+        except (orjson.JSONDecodeError, OSError):
             pass
 
-    with open(file_path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+    with open(file_path, "rb") as f:
+        for i, line in enumerate(f):
+            if i >= _DETECT_MAX_LINES:
+                break
+            # Every marker record carries a "type" key; a substring test on
+            # the raw bytes skips everything else without decoding it
+            if b'"type"' not in line:
                 continue
             try:
-                rec = json.loads(line)
-            except json.JSONDecodeError:
+                rec = orjson.loads(line)
+            except orjson.JSONDecodeError:
                 continue
-            # Claude Code transcripts have these type fields
-            if rec.get("type") in ("file-history-snapshot",):
-                return "claude_code"
-            if "sessionId" in rec and rec.get("type") in (
-                "user",
-                "assistant",
-                "progress",
-            ):
-                return "claude_code"
-            # Codex CLI rollout files have these record types
-            if rec.get("type") in ("session_meta", "response_item", "event_msg"):
-                return "codex"
-            # Codex legacy: type=message with role field
-            if rec.get("type") == "message" and "role" in rec:
-                return "codex"
-            # Gemini JSONL format
-            if rec.get("type") in ("session_metadata",):
-                return "gemini"
-            if rec.get("type") in ("user", "gemini") and "content" in rec:
-                # Gemini uses type="user"/"gemini"; Claude uses type="user" with sessionId
-                if "sessionId" not in rec:
-                    return "gemini"
-            # Codex turn_context events
-            if rec.get("type") == "turn_context":
-                return "codex"
+            if not isinstance(rec, dict):
+                continue
+            fmt = _detect_record(rec)
+            if fmt:
+                return fmt
     return "codex"
 
 
+def _detect_record(rec: dict) -> str | None:
+    """Classify a single JSONL record, or return None if it isn't a marker."""
+    # Claude Code transcripts have these type fields
+    if rec.get("type") in ("file-history-snapshot",):
+        return "claude_code"
+    if "sessionId" in rec and rec.get("type") in (
+        "user",
+        "assistant",
+        "progress",
+    ):
+        return "claude_code"
+    # Codex CLI rollout files have these record types
+    if rec.get("type") in ("session_meta", "response_item", "event_msg"):
+        return "codex"
+    # Codex legacy: type=message with role field
+    if rec.get("type") == "message" and "role" in rec:
+        return "codex"
+    # Gemini JSONL format
+    if rec.get("type") in ("session_metadata",):
+        return "gemini"
+    if rec.get("type") in ("user", "gemini") and "content" in rec:
+        # Gemini uses type="user"/"gemini"; Claude uses type="user" with sessionId
+        if "sessionId" not in rec:
+            return "gemini"
+    # Codex turn_context events
+    if rec.get("type") == "turn_context":
+        return "codex"
+    return None
+
+
 def parse(file_path: str | Path) -> Session:
     """Auto-detect format and parse a transcript file.
 
-    Results are cached by (resolved_path, mtime) so repeated calls for an
-    unchanged file skip all I/O and parsing.
+    Results are cached by resolved path and (size, mtime_ns) so repeated
+    calls for an unchanged file skip all I/O and parsing.  When a Claude Code transcript
+    has only been appended to, just the new records are read and merged
+    into the previous result (see ``_resume_claude_code``).
     """
     p = Path(file_path).resolve()
+    path_key = str(p)
     try:
-        mtime = p.stat().st_mtime
+        st = p.stat()
+        stat_key = (st.st_size, st.st_mtime_ns)
     except OSError:
-        mtime = 0.0
-    key = (str(p), mtime)
-
-    cached = _parse_cache.get(key)
-    if cached is not None:
-        return cached
-
-    fmt = auto_detect(file_path)
-    if fmt == "claude_code":
-        session = parse_claude_code(file_path)
-    elif fmt == "gemini":
-        session = parse_gemini(file_path)
-    else:
-        session = parse_codex(file_path)
-
-    # Evict stale entries for the same path (old mtimes)
-    stale_keys = [k for k in _parse_cache if k[0] == str(p) and k[1] != mtime]
-    for sk in stale_keys:
-        del _parse_cache[sk]
-    # Evict oldest entry if cache is still full
-    if len(_parse_cache) >= _PARSE_CACHE_MAX:
-        oldest = next(iter(_parse_cache))
-        del _parse_cache[oldest]
-    _parse_cache[key] = session
+        stat_key = (0, 0)
+
+    with _parse_cache_lock:
+        cached = _parse_cache.pop(path_key, None)
+        if cached is not None:
+            # Re-inserted either way so the path stays most recently used
+            _parse_cache[path_key] = cached
+        path_lock = _path_locks.get(path_key)
+        if path_lock is None:
+            path_lock = _path_locks[path_key] = threading.Lock()
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+
+    with path_lock:
+        with _parse_cache_lock:
+            cached = _parse_cache.get(path_key)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+        return _parse_uncached(file_path, p, path_key, stat_key)
+
+
+def _parse_uncached(
+    file_path: str | Path, p: Path, path_key: str, stat_key: Tuple[int, int]
+) -> Session:
+    """Parse *file_path* (resolved to *p*) and cache the result under *stat_key*."""
+    # A transcript that has only grown since it was last parsed is extended
+    # in place of a full re-parse.  Popping the state means a concurrent
+    # parse of the same file can't resume from it twice.  The transcript is
+    # read through the resolved *p*, which keys its resume mark; sub-agent
+    # lookups keep using *file_path* as given.
+    session = None
+    with _parse_cache_lock:
+        state = _resume_states.pop(path_key, None)
+    if state is not None:
+        try:
+            session = _resume_claude_code(Path(file_path), state)
+        except Exception:
+            # Any surprise while resuming just means a full re-parse
+            session = None
+
+    if session is None:
+        state = None
+        if p.suffix == ".json":
+            fmt = auto_detect(file_path)
+            records = None
+        else:
+            # Detect the format during the same pass that decodes the records
+            state = _ClaudeResume(main_path=p)
+            records, fmt = _read_jsonl_with_detect(p, state.marks)
+        if fmt == "claude_code":
+            session = _parse_claude_code(Path(file_path), records, state)
+        elif fmt == "gemini":
+            session = parse_gemini(file_path, records)
+            state = None
+        else:
+            session = parse_codex(file_path, records)
+            state = None
+
+    with _parse_cache_lock:
+        # Replacing the path's entry drops its stale version; then evict the
+        # least recently used entries if the cache is still over its bound
+        _parse_cache.pop(path_key, None)
+        while len(_parse_cache) >= _PARSE_CACHE_MAX:
+            del _parse_cache[next(iter(_parse_cache))]
+        if state is not None:
+            _resume_states[path_key] = state
+        while len(_resume_states) > _PARSE_CACHE_MAX:
+            del _resume_states[next(iter(_resume_states))]
+        _parse_cache[path_key] = (stat_key, session)
     return session
 
 
-def parse_codex(file_path: str | Path) -> Session:
+def parse_codex(file_path: str | Path, records: Iterable[dict] | None = None) -> Session:
     """Parse a Codex CLI rollout JSONL transcript into a Session.
 
     Codex CLI writes rollout files to ~/.codex/sessions/YYYY/MM/DD/rollout-*.jsonl.
@@ -144,7 +283,7 @@ def parse_codex(file_path: str | Path) -> Session:
     main_agent = Agent(id="main", name="Codex", color="green")
     session.agents["main"] = main_agent
 
-    lines = _read_jsonl(file_path)
+    lines = records if records is not None else _read_jsonl(file_path)
 
     for rec in lines:
         rec_type = rec.get("type", "")
@@ -158,7 +297,7 @@ def parse_codex(file_path: str | Path) -> Session:
 
         # --- response_item: conversation messages and tool calls ---
         if rec_type == "response_item":
-            item = rec.get("item", {})
+            item = rec.get("item", _EMPTY_DICT)
             item_type = item.get("type", "")
             role = item.get("role", "")
 
@@ -241,10 +380,10 @@ def parse_codex(file_path: str | Path) -> Session:
 
         # --- event_msg: token counts ---
         if rec_type == "event_msg":
-            payload = rec.get("payload", rec.get("msg", {}))
+            payload = rec.get("payload", rec.get("msg", _EMPTY_DICT))
             if isinstance(payload, dict) and payload.get("type") == "token_count":
-                info = payload.get("info", {})
-                usage = info.get("last_token_usage", {})
+                info = payload.get("info", _EMPTY_DICT)
+                usage = info.get("last_token_usage", _EMPTY_DICT)
                 in_tok = usage.get("input_tokens", 0)
                 out_tok = usage.get("output_tokens", 0)
                 cache_tok = usage.get("cached_input_tokens", 0) or usage.get(
@@ -257,14 +396,14 @@ def parse_codex(file_path: str | Path) -> Session:
 
         # --- turn_context: model info ---
         if rec_type == "turn_context":
-            payload = rec.get("payload", {})
+            payload = rec.get("payload", _EMPTY_DICT)
             model = payload.get("model", "")
             if model:
                 session.version = model
             continue
 
     # Sort events by timestamp
-    session.events.sort(key=lambda e: e.timestamp)
+    session.events.sort(key=attrgetter("timestamp"))
 
     # Derive start_time from first event if not set via session_meta
     if not session.start_time and session.events:
@@ -292,7 +431,7 @@ def _extract_codex_content(content: str | list) -> str:
     return str(content) if content else ""
 
 
-def parse_gemini(file_path: str | Path) -> Session:
+def parse_gemini(file_path: str | Path, records: Iterable[dict] | None = None) -> Session:
     """Parse a Gemini CLI session log into a Session.
 
     Gemini CLI currently stores sessions as JSON files in
@@ -319,10 +458,10 @@ def parse_gemini(file_path: str | Path) -> Session:
     if file_path.suffix == ".json":
         _parse_gemini_json(file_path, session, main_agent)
     else:
-        _parse_gemini_jsonl(file_path, session, main_agent)
+        _parse_gemini_jsonl(file_path, session, main_agent, records)
 
     # Sort events and set metadata
-    session.events.sort(key=lambda e: e.timestamp)
+    session.events.sort(key=attrgetter("timestamp"))
     if session.events:
         if not session.start_time:
             session.start_time = session.events[0].timestamp
@@ -333,8 +472,8 @@ def parse_gemini(file_path: str | Path) -> Session:
 
 def _parse_gemini_json(file_path: Path, session: Session, agent: Agent) -> None:
     """Parse legacy Gemini CLI JSON session file."""
-    with open(file_path, encoding="utf-8") as f:
-        data = json.load(f)
+    with open(file_path, "rb") as f:
+        data = orjson.loads(f.read())
 
     messages: list = []
     if isinstance(data, dict):
@@ -372,7 +511,7 @@ def _parse_gemini_json(file_path: Path, session: Session, agent: Agent) -> None:
             fc = part.get("functionCall")
             if fc and isinstance(fc, dict):
                 tool_name = fc.get("name", "unknown")
-                args = fc.get("args", {})
+                args = fc.get("args", _EMPTY_DICT)
                 event_type = EventType.BASH if tool_name in ("run_shell", "shell") else EventType.TOOL_CALL
                 if "edit" in tool_name.lower() or "update" in tool_name.lower():
                     event_type = EventType.FILE_UPDATE
@@ -393,7 +532,7 @@ def _parse_gemini_json(file_path: Path, session: Session, agent: Agent) -> None:
             # Function response (tool result)
             fr = part.get("functionResponse")
             if fr and isinstance(fr, dict):
-                response = fr.get("response", {})
+                response = fr.get("response", _EMPTY_DICT)
                 session.events.append(
                     Event(
                         timestamp=timestamp,
@@ -404,9 +543,11 @@ def _parse_gemini_json(file_path: Path, session: Session, agent: Agent) -> None:
                 )
 
 
-def _parse_gemini_jsonl(file_path: Path, session: Session, agent: Agent) -> None:
+def _parse_gemini_jsonl(
+    file_path: Path, session: Session, agent: Agent, records: Iterable[dict] | None = None
+) -> None:
     """Parse Gemini CLI JSONL session file."""
-    lines = _read_jsonl(file_path)
+    lines = records if records is not None else _read_jsonl(file_path)
 
     for rec in lines:
         rec_type = rec.get("type", "")
@@ -431,7 +572,7 @@ def _parse_gemini_jsonl(file_path: Path, session: Session, agent: Agent) -> None
                     fc = block.get("functionCall")
                     if fc and isinstance(fc, dict):
                         tool_name = fc.get("name", "unknown")
-                        args = fc.get("args", {})
+                        args = fc.get("args", _EMPTY_DICT)
                         tc_type = EventType.BASH if tool_name in ("run_shell", "shell") else EventType.TOOL_CALL
                         session.events.append(
                             Event(
@@ -459,77 +600,122 @@ def _parse_gemini_jsonl(file_path: Path, session: Session, agent: Agent) -> None
 
         # Token updates
         if rec_type == "message_update":
-            tokens = rec.get("tokens", {})
+            tokens = rec.get("tokens", _EMPTY_DICT)
             agent.input_tokens += tokens.get("input", 0)
             agent.output_tokens += tokens.get("output", 0)
             continue
 
 
-def parse_claude_code(file_path: str | Path) -> Session:
-    """Parse a Claude Code JSONL transcript into a Session."""
-    file_path = Path(file_path)
+def _list_subagent_files(subagent_dir: Path) -> list[Path]:
+    """Return the ``agent-*.jsonl`` files in *subagent_dir*, sorted by name.
+
+    A single ``scandir`` pass with a plain prefix/suffix test, instead of
+    ``Path.glob`` compiling a pattern and wrapping every entry in a Path.
+    """
+    with os.scandir(subagent_dir) as it:
+        names = sorted(
+            e.name
+            for e in it
+            if e.name.startswith("agent-") and e.name.endswith(".jsonl") and e.is_file()
+        )
+    return [subagent_dir / name for name in names]
+
+
+def parse_claude_code(file_path: str | Path, records: Iterable[dict] | None = None) -> Session:
+    """Parse a Claude Code JSONL transcript into a Session.
+
+    *records* may be passed when the caller has already started decoding
+    the main transcript (see ``parse``), avoiding a second read of the file.
+    """
+    return _parse_claude_code(Path(file_path), records, None)
+
+
+@dataclass(slots=True)
+class _ClaudeResume:
+    """Where a Claude Code parse stopped, so appended records can be added
+    later without re-reading anything (see ``_resume_claude_code``)."""
+
+    session: Session | None = None
+    # The path the main transcript was read from, which keys its mark; may be
+    # the resolved form of the path used to find sub-agent files
+    main_path: Path | None = None
+    # str(path) -> (st_ino, offset past the last complete line, its trailing
+    # bytes) for the main transcript and every sub-agent file; None if the
+    # read ended on an unterminated record, which can't be resumed exactly
+    marks: dict[str, Tuple[int, int, bytes] | None] = field(default_factory=dict)
+    # agent_id -> (seen_request_ids, request_tokens_assigned) of _process_lines
+    request_state: dict[str, Tuple[set, set]] = field(default_factory=dict)
+    # agent_id -> processing order; breaks timestamp ties like the full sort
+    ranks: dict[str, int] = field(default_factory=dict)
+    # False when a resume can't reproduce a full parse: the session id came
+    # from the file name, or two sub-agent files share an agent id
+    resumable: bool = True
+    session_id: str = ""
+    meta_rec: dict | None = None
+    subagent_dir: Path | None = None
+    subagent_files: list[Path] = field(default_factory=list)
+    # Agent id registered from each sub-agent file (None for an empty file)
+    subagent_ids: list[str | None] = field(default_factory=list)
+    color_idx: int = 0
+
+
+def _parse_claude_code(
+    file_path: Path, records: Iterable[dict] | None, resume: _ClaudeResume | None
+) -> Session:
+    """Parse a Claude Code transcript, recording resume state when given."""
     session = Session(id="unknown")
     main_agent = Agent(id="main", name="Main", color="cyan")
     session.agents["main"] = main_agent
-    color_idx = 0
-
-    # Collect main session lines
-    lines = _read_jsonl(file_path)
+    if resume is None:
+        resume = _ClaudeResume()
+    if resume.main_path is None:
+        resume.main_path = file_path
+    resume.ranks["main"] = 0
+
+    # Capture session-level metadata while the main records stream through
+    # _process_lines, so the transcript is walked once and never buffered
+    session_id: str | None = None
+
+    def _tap_metadata(recs: Iterable[dict]) -> Iterator[dict]:
+        nonlocal session_id
+        for rec in recs:
+            if resume.meta_rec is None and "sessionId" in rec:
+                if session_id is None:
+                    session_id = rec["sessionId"]
+                if rec.get("type") in ("user", "assistant"):
+                    resume.meta_rec = rec
+            yield rec
 
-    # Extract session ID from records for subagent lookup
-    session_id = file_path.stem
-    for rec in lines:
-        if "sessionId" in rec:
-            session_id = rec["sessionId"]
-            break
+    # Process main session lines
+    lines = records if records is not None else _read_jsonl(file_path, marks=resume.marks)
+    resume.request_state["main"] = (set(), set())
+    _process_lines(_tap_metadata(lines), "main", session, resume.request_state["main"])
+    if session_id is None:
+        resume.resumable = False
+        session_id = file_path.stem
+    resume.session_id = session_id
 
     # Discover sub-agent files (check both filename stem and session ID dirs)
-    subagent_files: list[Path] = []
     for candidate_dir in [
         file_path.parent / file_path.stem / "subagents",
         file_path.parent / session_id / "subagents",
     ]:
         if candidate_dir.is_dir():
-            subagent_files = sorted(candidate_dir.glob("agent-*.jsonl"))
+            resume.subagent_dir = candidate_dir
             break
+    if resume.subagent_dir is not None:
+        for sa_file in _list_subagent_files(resume.subagent_dir):
+            _add_subagent(session, sa_file, resume)
 
-    # Parse sub-agent files to register agents and collect their events
-    subagent_events: list[tuple[str, list[dict]]] = []
-    for sa_file in subagent_files:
-        sa_lines = _read_jsonl(sa_file)
-        if not sa_lines:
-            continue
-        agent_id = sa_lines[0].get("agentId", sa_file.stem.replace("agent-", ""))
-        short_id = agent_id[:7] if len(agent_id) > 7 else agent_id
-        agent = Agent(
-            id=agent_id,
-            name=short_id,
-            is_subagent=True,
-            color=AGENT_COLORS[color_idx % len(AGENT_COLORS)],
-        )
-        color_idx += 1
-        session.agents[agent_id] = agent
-        subagent_events.append((agent_id, sa_lines))
-
-    # Process main session lines
-    _process_lines(lines, "main", session)
-
-    # Process sub-agent lines
-    for agent_id, sa_lines in subagent_events:
-        _process_lines(sa_lines, agent_id, session)
-
-    # Sort all events by timestamp
-    session.events.sort(key=lambda e: e.timestamp)
+    # Sort all events by timestamp: pull the keys into one flat list and sort
+    # indices over it, so comparisons never touch Event attributes
+    events = session.events
+    timestamps = [e.timestamp for e in events]
+    order = sorted(range(len(events)), key=timestamps.__getitem__)
+    session.events = [events[i] for i in order]
 
     # Set session metadata from first meaningful record
-    for rec in lines:
-        if rec.get("type") in ("user", "assistant") and "sessionId" in rec:
-            session.id = rec.get("sessionId", session.id)
-            session.slug = rec.get("slug", "")
-            session.version = rec.get("version", "")
-            session.branch = rec.get("gitBranch", "")
-            session.start_time = rec.get("timestamp", "")
-            break
+    _apply_metadata(session, resume.meta_rec)
 
     # Set agent spawn times
     for event in session.events:
@@ -537,44 +723,286 @@ def parse_claude_code(file_path: str | Path) -> Session:
         if agent and not agent.spawn_time:
             agent.spawn_time = event.timestamp
 
+    resume.session = session
+    return session
+
+
+def _add_subagent(session: Session, sa_file: Path, resume: _ClaudeResume) -> None:
+    """Register a sub-agent from its first record, then stream the rest."""
+    resume.subagent_files.append(sa_file)
+    sa_lines = _read_jsonl(sa_file, marks=resume.marks)
+    first = next(sa_lines, None)
+    if first is None:
+        resume.subagent_ids.append(None)
+        return
+    agent_id = first.get("agentId", sa_file.stem.replace("agent-", ""))
+    resume.subagent_ids.append(agent_id)
+    short_id = agent_id[:7] if len(agent_id) > 7 else agent_id
+    agent = Agent(
+        id=agent_id,
+        name=short_id,
+        is_subagent=True,
+        color=AGENT_COLORS[resume.color_idx % len(AGENT_COLORS)],
+    )
+    resume.color_idx += 1
+    session.agents[agent_id] = agent
+    if agent_id in resume.ranks:
+        resume.resumable = False
+    resume.ranks.setdefault(agent_id, len(resume.ranks))
+    request_state = resume.request_state.setdefault(agent_id, (set(), set()))
+    _process_lines(itertools.chain((first,), sa_lines), agent_id, session, request_state)
+
+
+def _apply_metadata(session: Session, meta_rec: dict | None) -> None:
+    if meta_rec is not None:
+        session.id = meta_rec.get("sessionId", session.id)
+        session.slug = meta_rec.get("slug", "")
+        session.version = meta_rec.get("version", "")
+        session.branch = meta_rec.get("gitBranch", "")
+        session.start_time = meta_rec.get("timestamp", "")
+
+
+def _resume_claude_code(file_path: Path, state: _ClaudeResume) -> Session | None:
+    """Extend a parsed Claude Code session with records appended since.
+
+    Returns a new Session equal to what a full parse would produce, reading
+    only the bytes past each file's resume mark, or None when the files
+    changed in a way appends don't explain (truncation, replacement, no
+    bytes appended anywhere, a sub-agent file added anywhere but last in
+    sort order) and the caller must re-parse from scratch.  See
+    ``_mark_holds`` for the rewrites that can't be told from appends.
+    """
+    old = state.session
+    if old is None or not state.resumable:
+        return None
+
+    # The sub-agent file list may only have grown at its end, since agent
+    # colors are assigned in sorted file order
+    sa_files = state.subagent_files
+    if state.subagent_dir is None:
+        for candidate_dir in [
+            file_path.parent / file_path.stem / "subagents",
+            file_path.parent / state.session_id / "subagents",
+        ]:
+            if candidate_dir.is_dir():
+                return None
+        current = []
+    else:
+        current = _list_subagent_files(state.subagent_dir)
+        if current[: len(sa_files)] != sa_files:
+            return None
+
+    # Every previously read file must still hold what was read from it
+    tails: list[Tuple[Path, int, str]] = []
+    grew = False
+    for path, agent_id in zip([state.main_path] + sa_files, ["main"] + state.subagent_ids):
+        mark = state.marks.get(str(path))
+        if mark is None:
+            return None
+        size = _mark_holds(path, mark)
+        if size is None:
+            return None
+        if agent_id is None:
+            # An empty sub-agent file that has since gained records would
+            # shift the colors of every agent registered after it
+            if size > mark[1]:
+                return None
+            continue
+        grew = grew or size > mark[1]
+        tails.append((path, mark[1], agent_id))
+    new_files = current[len(sa_files):]
+
+    # parse() only resumes once the transcript's size or mtime changed; if
+    # nothing was appended anywhere, that change was a rewrite in place
+    if not grew and not new_files:
+        return None
+
+    session = Session(
+        id=old.id,
+        slug=old.slug,
+        version=old.version,
+        branch=old.branch,
+        start_time=old.start_time,
+        agents={k: dataclasses.replace(a) for k, a in old.agents.items()},
+    )
+
+    meta_found = state.meta_rec is not None
+    for path, offset, agent_id in tails:
+        lines = _read_jsonl(path, offset, state.marks)
+        if agent_id == "main" and not meta_found:
+            lines = _tap_meta_rec(lines, state)
+        _process_lines(lines, agent_id, session, state.request_state[agent_id])
+    for sa_file in new_files:
+        _add_subagent(session, sa_file, state)
+    if not meta_found and state.meta_rec is not None:
+        _apply_metadata(session, state.meta_rec)
+
+    # Merge: old events are already in final order, so when every new event
+    # sorts after the last old one the lists simply concatenate
+    ranks = state.ranks
+    added = session.events
+    added.sort(key=lambda e: (e.timestamp, ranks[e.agent_id]))
+    if added and old.events:
+        last = old.events[-1]
+        first = added[0]
+        if (first.timestamp, ranks[first.agent_id]) < (last.timestamp, ranks[last.agent_id]):
+            merged = old.events + added
+            merged.sort(key=lambda e: (e.timestamp, ranks[e.agent_id]))
+            session.events = merged
+        else:
+            session.events = old.events + added
+    else:
+        session.events = old.events + added
+
+    # Spawn time is the earliest non-empty timestamp of each agent's events
+    agents = session.agents
+    for event in added:
+        agent = agents.get(event.agent_id)
+        if agent and event.timestamp and (
+            not agent.spawn_time or event.timestamp < agent.spawn_time
+        ):
+            agent.spawn_time = event.timestamp
+
+    state.session = session
     return session
 
 
-def _read_jsonl(path: Path) -> list[dict]:
-    """Read a JSONL file, returning parsed records."""
-    records = []
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
+def _mark_holds(path: Path, mark: Tuple[int, int, bytes]) -> int | None:
+    """Return *path*'s size if it still looks like the file *mark* was taken from.
+
+    The file must be the same inode, no shorter than the mark, and still
+    have the recorded bytes just before the mark.  That rules out
+    replacement, truncation and most rewrites, but not all: a rewrite in
+    place that keeps those bytes passes.  ``_resume_claude_code`` falls back
+    to a full parse when nothing grew past its mark; a rewrite that also
+    grows the file and keeps the bytes before the mark is taken for an
+    append.
+    """
+    ino, offset, tail = mark
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if st.st_ino != ino or st.st_size < offset:
+            return None
+        if tail:
+            f.seek(offset - len(tail))
+            if f.read(len(tail)) != tail:
+                return None
+    return st.st_size
+
+
+def _tap_meta_rec(recs: Iterable[dict], state: _ClaudeResume) -> Iterator[dict]:
+    for rec in recs:
+        if state.meta_rec is None and "sessionId" in rec and rec.get("type") in ("user", "assistant"):
+            state.meta_rec = rec
+        yield rec
+
+
+def _read_jsonl(
+    path: Path, start: int = 0, marks: dict[str, Tuple[int, int, bytes] | None] | None = None
+) -> Iterator[dict]:
+    """Lazily yield parsed records from a JSONL file, one line at a time.
+
+    Reading begins at byte *start*.  When *marks* is given, the file's
+    inode, the offset just past its last complete line and that line's
+    trailing bytes are stored under ``str(path)`` once it is exhausted, so a
+    later read can check the file and resume there (see ``_mark_holds``).
+    """
+    with open(path, "rb") as f:
+        if start:
+            f.seek(start)
+        offset = start
+        resumable = True
+        last = b""
+        for raw in f:
+            terminated = raw[-1:] == b"\n"
+            if terminated:
+                offset += len(raw)
+                last = raw
+            line = raw.strip()
             if not line:
                 continue
             try:
-                records.append(json.loads(line))
-            except json.JSONDecodeError:
+                rec = orjson.loads(line)
+            except orjson.JSONDecodeError:
                 continue
-    return records
+            if not terminated:
+                # A complete record without a trailing newline; appending
+                # to it would change its meaning, so it can't be resumed
+                resumable = False
+            yield rec
+        if marks is not None:
+            if resumable:
+                if not last and offset:
+                    # Nothing new was read; keep the fingerprint from before
+                    prev = marks.get(str(path))
+                    last = prev[2] if prev else b""
+                marks[str(path)] = (os.fstat(f.fileno()).st_ino, offset, last[-_MARK_TAIL:])
+            else:
+                marks[str(path)] = None
+
+
+def _read_jsonl_with_detect(
+    path: Path, marks: dict[str, Tuple[int, int, bytes] | None] | None = None
+) -> tuple[Iterator[dict], str]:
+    """Start streaming a JSONL file and detect its format from the head.
+
+    Only the records needed to identify the format are buffered; the
+    returned iterator replays them and then continues with the rest of the
+    file.  fmt follows ``auto_detect``'s conventions.
+    """
+    records = _read_jsonl(path, marks=marks)
+    head: list[dict] = []
+    fmt = None
+    for rec in records:
+        head.append(rec)
+        fmt = _detect_record(rec)
+        if fmt or len(head) >= _DETECT_MAX_LINES:
+            break
+    return itertools.chain(head, records), fmt or "codex"
 
 
-def _process_lines(lines: list[dict], agent_id: str, session: Session) -> None:
-    """Process JSONL records into events on the session."""
+def _process_lines(
+    lines: Iterable[dict],
+    agent_id: str,
+    session: Session,
+    request_state: Tuple[set, set] | None = None,
+) -> None:
+    """Process JSONL records into events on the session.
+
+    *request_state* carries the request-id tracking sets between calls for
+    the same agent, so records processed in several batches are attributed
+    exactly as in a single pass.
+    """
     agent = session.agents.get(agent_id)
-    seen_request_ids: set[str] = set()  # Track to avoid double-counting agent tokens
-    request_tokens_assigned: set[str] = set()  # Track per-event token attribution
+    if request_state is None:
+        request_state = (set(), set())
+    # Track to avoid double-counting agent tokens, and per-event attribution
+    seen_request_ids, request_tokens_assigned = request_state
+
+    # Hot-loop names bound to locals once, sparing a global + attribute
+    # lookup per event
+    append = session.events.append
+    make_event = Event
+    user_type = EventType.USER
+    think_type = EventType.THINK
+    text_type = EventType.TEXT
+    result_type = EventType.TOOL_RESULT
+    error_type = EventType.ERROR
 
     for rec in lines:
         rec_type = rec.get("type")
         timestamp = rec.get("timestamp", "")
 
         if rec_type == "user":
-            msg = rec.get("message", {})
+            msg = rec.get("message", _EMPTY_DICT)
             content = msg.get("content", "")
 
             # User text message
             if isinstance(content, str) and content.strip():
-                session.events.append(
-                    Event(
+                append(
+                    make_event(
                         timestamp=timestamp,
-                        type=EventType.USER,
+                        type=user_type,
                         agent_id=agent_id,
                         content=content,
                     )
@@ -595,19 +1023,19 @@ def _process_lines(lines: list[dict], agent_id: str, session: Session) -> None:
                                     parts.append(rb.get("text", ""))
                             result_text = "\n".join(parts)
                         is_error = block.get("is_error", False)
-                        session.events.append(
-                            Event(
+                        append(
+                            make_event(
                                 timestamp=timestamp,
-                                type=EventType.ERROR if is_error else EventType.TOOL_RESULT,
+                                type=error_type if is_error else result_type,
                                 agent_id=agent_id,
                                 content=str(result_text),
                             )
                         )
 
         elif rec_type == "assistant":
-            msg = rec.get("message", {})
-            content_blocks = msg.get("content", [])
-            usage = msg.get("usage", {})
+            msg = rec.get("message", _EMPTY_DICT)
+            content_blocks = msg.get("content", ())
+            usage = msg.get("usage", _EMPTY_DICT)
 
             # Track tokens (only once per requestId to avoid double-counting)
             request_id = rec.get("requestId", "")
@@ -626,12 +1054,8 @@ def _process_lines(lines: list[dict], agent_id: str, session: Session) -> None:
             if not isinstance(content_blocks, list):
                 continue
 
-            def _event_tokens() -> tuple[int, int, int]:
-                """Return tokens for the first event per request, zero after."""
-                if request_id and request_id not in request_tokens_assigned:
-                    request_tokens_assigned.add(request_id)
-                    return in_tok, out_tok, cache_tok
-                return 0, 0, 0
+            # Per-event tokens go to the first event of each request, zero after
+            tokens_pending = bool(request_id) and request_id not in request_tokens_assigned
 
             for block in content_blocks:
                 if not isinstance(block, dict):
@@ -641,11 +1065,16 @@ def _process_lines(lines: list[dict], agent_id: str, session: Session) -> None:
                 if block_type == "thinking":
                     thinking_text = block.get("thinking", "")
                     if thinking_text.strip():
-                        et_in, et_out, et_cache = _event_tokens()
-                        session.events.append(
-                            Event(
+                        if tokens_pending:
+                            request_tokens_assigned.add(request_id)
+                            tokens_pending = False
+                            et_in, et_out, et_cache = in_tok, out_tok, cache_tok
+                        else:
+                            et_in = et_out = et_cache = 0
+                        append(
+                            make_event(
                                 timestamp=timestamp,
-                                type=EventType.THINK,
+                                type=think_type,
                                 agent_id=agent_id,
                                 content=thinking_text,
                                 input_tokens=et_in,
@@ -657,10 +1086,10 @@ def _process_lines(lines: list[dict], agent_id: str, session: Session) -> None:
                 elif block_type == "text":
                     text = block.get("text", "").strip()
                     if text:
-                        session.events.append(
-                            Event(
+                        append(
+                            make_event(
                                 timestamp=timestamp,
-                                type=EventType.TEXT,
+                                type=text_type,
                                 agent_id=agent_id,
                                 content=text,
                             )
@@ -668,33 +1097,20 @@ def _process_lines(lines: list[dict], agent_id: str, session: Session) -> None:
 
                 elif block_type == "tool_use":
                     tool_name = block.get("name", "unknown")
-                    tool_input = block.get("input", {})
-                    event_type = TOOL_TYPE_MAP.get(tool_name, EventType.TOOL_CALL)
-
-                    file_path = ""
-                    description = ""
-
-                    if tool_name in ("Read", "Write", "Edit"):
-                        file_path = tool_input.get("file_path", "")
-                    elif tool_name == "Bash":
-                        description = tool_input.get("description", "") or tool_input.get("command", "")
-                    elif tool_name == "Task":
-                        description = tool_input.get("description", "")
-                        event_type = EventType.SPAWN
-                    elif tool_name in ("Glob", "Grep"):
-                        description = tool_input.get("pattern", "")
-                    elif tool_name == "WebSearch":
-                        description = tool_input.get("query", "")
-                    elif tool_name == "WebFetch":
-                        description = tool_input.get("url", "")
-                    else:
-                        description = str(tool_input)
+                    tool_input = block.get("input", _EMPTY_DICT)
+                    event_type, handler = _TOOL_HANDLERS.get(tool_name, _DEFAULT_TOOL_HANDLER)
+                    file_path, description = handler(tool_input)
 
                     content = description or file_path
-                    et_in, et_out, et_cache = _event_tokens()
+                    if tokens_pending:
+                        request_tokens_assigned.add(request_id)
+                        tokens_pending = False
+                        et_in, et_out, et_cache = in_tok, out_tok, cache_tok
+                    else:
+                        et_in = et_out = et_cache = 0
 
-                    session.events.append(
-                        Event(
+                    append(
+                        make_event(
                             timestamp=timestamp,
                             type=event_type,
                             agent_id=agent_id,
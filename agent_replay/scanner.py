@@ -2,19 +2,65 @@
 
 from __future__ import annotations
 
+import atexit
 import json
+import logging
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple
+from typing import BinaryIO, FrozenSet, Iterator, List, Tuple
+
+import orjson
 
 from .models import SessionSummary
 
+logger = logging.getLogger(__name__)
+
 # File modified within this many seconds is considered active
 ACTIVE_THRESHOLD = 60
 
-# TTL cache for scan_sessions: (result, timestamp)
-_scan_cache: dict[str, Tuple[List[SessionSummary], float]] = {}
-_SCAN_TTL = 5.0  # seconds
+# Directory listings keyed on path -> (st_mtime_ns, subdir names, file names).
+# A directory's mtime changes whenever an entry is added or removed, so an
+# unchanged mtime means the cached listing is still exact.
+_dir_cache: dict[str, Tuple[int, FrozenSet[str], List[str]]] = {}
+
+# Listings for directories modified this recently are not trusted, since a
+# coarse-grained mtime could hide an entry created in the same tick
+_DIR_MTIME_SLACK_NS = 2_000_000_000
+
+# Per-file summaries keyed on path -> (st_mtime_ns, st_size, summary); an
+# unchanged file costs one stat instead of an open + read.  The key doesn't
+# cover sub-agent transcripts, so ``agent_count`` is recounted on every hit
+_summary_cache: dict[str, Tuple[int, int, SessionSummary]] = {}
+
+# Summaries persist across restarts in a JSON file under the user cache dir;
+# entries are revalidated against (st_mtime_ns, st_size) like in-memory ones.
+# ``agent_count`` isn't saved; the first cache hit recounts it
+_DISK_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "agent-replay"
+    / "summaries.json"
+)
+_DISK_CACHE_VERSION = 2
+_DISK_FLUSH_INTERVAL = 30  # seconds between rewrites while entries change
+_disk_cache_loaded = False
+_disk_cache_dirty = False
+_disk_cache_flushed_at = 0.0
+
+# Scans run on worker threads (asyncio.to_thread); serialize them so the
+# caches above are never mutated concurrently
+_scan_lock = threading.Lock()
+
+# Thread pool for building summaries in parallel; only used once a
+# directory holds enough files to outweigh the dispatch overhead
+_scan_pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4))
+_PARALLEL_MIN_FILES = 8
+
+# Number of leading JSONL lines inspected for session metadata
+_METADATA_LINES = 20
 
 # Default directories to scan for each agent tool.
 # Each tuple is (directory_path, source_label, file_glob_patterns).
@@ -35,94 +81,354 @@ def scan_sessions(base_dir: Path | None = None) -> list[SessionSummary]:
     When *base_dir* is ``None`` the scanner checks each of the default agent
     tool directories (Claude Code, Codex CLI, Gemini CLI) if they exist.
 
-    Results are cached with a 5-second TTL to avoid re-globbing on every
-    API request and WebSocket poll.
+    Directory listings and per-file summaries are cached and validated
+    against mtimes, so a rescan of an unchanged tree costs only ``stat``
+    calls — no directory reads and no file reads.  Summaries are also
+    persisted under ``$XDG_CACHE_HOME/agent-replay`` so this holds across
+    restarts.
     """
-    if base_dir is not None:
-        return _scan_single_dir(base_dir, source="claude")
+    with _scan_lock:
+        if not _disk_cache_loaded:
+            _load_disk_cache()
 
-    # Build a stable cache key from the set of default dirs
-    cache_key = "__multi__"
-    now = time.time()
-    cached = _scan_cache.get(cache_key)
-    if cached is not None:
-        result, cached_at = cached
-        if now - cached_at < _SCAN_TTL:
-            return result
+        if base_dir is not None:
+            summaries = _scan_single_dir(base_dir, source="claude")
+        else:
+            summaries = []
+            for dir_path, source, patterns in _DEFAULT_SOURCES:
+                if dir_path.is_dir():
+                    summaries.extend(_scan_single_dir(dir_path, source=source))
 
-    summaries: list[SessionSummary] = []
-    for dir_path, source, patterns in _DEFAULT_SOURCES:
-        if dir_path.is_dir():
-            summaries.extend(_scan_single_dir(dir_path, source=source, _skip_cache=True))
+            # Sort by recency, active first
+            summaries.sort(key=lambda s: (s.is_active, s.last_modified), reverse=True)
 
-    # Sort by recency, active first
-    summaries.sort(key=lambda s: (s.is_active, s.last_modified), reverse=True)
-    _scan_cache[cache_key] = (summaries, time.time())
-    return summaries
+        if _disk_cache_dirty and time.time() - _disk_cache_flushed_at >= _DISK_FLUSH_INTERVAL:
+            _flush_disk_cache()
+        return summaries
 
 
-def _scan_single_dir(
-    base_dir: Path,
-    source: str = "claude",
-    _skip_cache: bool = False,
-) -> list[SessionSummary]:
+def session_roots(base_dir: Path | None = None) -> list[Path]:
+    """Return the existing directories ``scan_sessions(base_dir)`` would scan."""
+    if base_dir is not None:
+        return [base_dir] if base_dir.is_dir() else []
+    return [dir_path for dir_path, _, _ in _DEFAULT_SOURCES if dir_path.is_dir()]
+
+
+def _load_disk_cache() -> None:
+    """Seed ``_summary_cache`` from the on-disk cache, ignoring any damage."""
+    global _disk_cache_loaded
+    _disk_cache_loaded = True
+    try:
+        data = orjson.loads(_DISK_CACHE_PATH.read_bytes())
+        if data.get("version") != _DISK_CACHE_VERSION:
+            return
+        for path, (mtime_ns, size, fields) in data["entries"].items():
+            summary = SessionSummary(agent_count=1, **fields)
+            _summary_cache.setdefault(path, (mtime_ns, size, summary))
+    except FileNotFoundError:
+        pass
+    except (OSError, orjson.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError) as exc:
+        logger.warning("Ignoring unreadable summary cache %s: %s", _DISK_CACHE_PATH, exc)
+
+
+def _flush_disk_cache() -> None:
+    """Write ``_summary_cache`` to disk atomically (temp file + rename)."""
+    global _disk_cache_dirty, _disk_cache_flushed_at
+    _disk_cache_dirty = False
+    _disk_cache_flushed_at = time.time()
+    entries = {}
+    for path, (mtime_ns, size, summary) in _summary_cache.items():
+        fields = summary.to_dict()
+        del fields["agent_count"]
+        entries[path] = [mtime_ns, size, fields]
+    payload = {"version": _DISK_CACHE_VERSION, "entries": entries}
+    tmp = _DISK_CACHE_PATH.with_suffix(".tmp")
+    try:
+        _DISK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(orjson.dumps(payload))
+        os.replace(tmp, _DISK_CACHE_PATH)
+    except OSError as exc:
+        logger.warning("Could not write summary cache %s: %s", _DISK_CACHE_PATH, exc)
+
+
+@atexit.register
+def _flush_disk_cache_at_exit() -> None:
+    with _scan_lock:
+        if _disk_cache_dirty:
+            _flush_disk_cache()
+
+
+def _scan_single_dir(base_dir: Path, source: str = "claude") -> list[SessionSummary]:
     """Scan a single directory tree for session files."""
+    global _disk_cache_dirty
     if not base_dir.is_dir():
         return []
 
-    cache_key = f"{source}:{base_dir}"
-    if not _skip_cache:
-        now = time.time()
-        cached = _scan_cache.get(cache_key)
-        if cached is not None:
-            result, cached_at = cached
-            if now - cached_at < _SCAN_TTL:
-                return result
-
-    # Determine which globs to use based on source
+    candidates: list[str] = []
     if source == "gemini":
         # Gemini: look for logs.json and session-*.jsonl in hash subdirs
-        candidates: list[Path] = []
-        for child in base_dir.iterdir():
-            if child.is_dir():
-                logs_json = child / "logs.json"
-                if logs_json.is_file():
-                    candidates.append(logs_json)
-                for f in child.glob("session-*.jsonl"):
-                    candidates.append(f)
+        subdirs, files = _list_dir(str(base_dir))
+        for name in subdirs:
+            child = os.path.join(base_dir, name)
+            _, child_files = _list_dir(child)
+            for fname in child_files:
+                if fname == "logs.json" or (
+                    fname.startswith("session-") and fname.endswith(".jsonl")
+                ):
+                    candidates.append(os.path.join(child, fname))
         # Also check for top-level JSONL files
-        for f in base_dir.glob("*.jsonl"):
-            candidates.append(f)
+        candidates.extend(os.path.join(base_dir, f) for f in files if f.endswith(".jsonl"))
     else:
-        candidates = [
-            c
-            for c in base_dir.rglob("*.jsonl")
-            if "subagents" not in str(c)
-        ]
+        candidates = list(_iter_jsonl_files(str(base_dir)))
 
     now = time.time()
     summaries: list[SessionSummary] = []
-
+    misses: list[tuple[str, os.stat_result]] = []
     for path in candidates:
         try:
-            summary = _build_summary(path, source, now)
-            if summary is not None:
-                summaries.append(summary)
-        except (OSError, PermissionError):
+            stat = os.stat(path)
+        except OSError:
             continue
+        cached = _summary_cache.get(path)
+        if (
+            cached is not None
+            and cached[0] == stat.st_mtime_ns
+            and cached[1] == stat.st_size
+            and cached[2].source == source
+        ):
+            summary = cached[2]
+            summary.is_active = (now - summary.last_modified) < ACTIVE_THRESHOLD
+            if source == "claude":
+                # A new agent-*.jsonl leaves the main transcript untouched;
+                # the recount only reads listings ``_dir_cache`` already holds
+                summary.agent_count = 1 + _count_subagents(Path(path), summary.id)
+            summaries.append(summary)
+        else:
+            misses.append((path, stat))
+
+    def _summarize(miss: tuple[str, os.stat_result]) -> SessionSummary | None:
+        path, stat = miss
+        try:
+            summary = _build_summary(Path(path), source, now, stat)
+        except (OSError, PermissionError):
+            return None
+        if summary is not None:
+            _summary_cache[path] = (stat.st_mtime_ns, stat.st_size, summary)
+        return summary
+
+    # Summaries are I/O-bound (stat + open + read) and the GIL is released
+    # during those calls, so larger batches are fanned out to threads
+    if len(misses) >= _PARALLEL_MIN_FILES:
+        results = _scan_pool.map(_summarize, misses)
+    else:
+        results = map(_summarize, misses)
+    summaries.extend(summary for summary in results if summary is not None)
+
+    # Drop cached summaries for files under this tree that have disappeared
+    prefix = str(base_dir) + os.sep
+    seen = set(candidates)
+    stale = [k for k in _summary_cache if k.startswith(prefix) and k not in seen]
+    for key in stale:
+        del _summary_cache[key]
+
+    if misses or stale:
+        _disk_cache_dirty = True
 
     # Sort by recency, active first
     summaries.sort(key=lambda s: (s.is_active, s.last_modified), reverse=True)
-    if not _skip_cache:
-        _scan_cache[cache_key] = (summaries, time.time())
     return summaries
 
 
+def _list_dir(path: str) -> Tuple[FrozenSet[str], List[str]]:
+    """Return (subdir names, file names) for *path*, cached on its mtime."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return frozenset(), []
+    cached = _dir_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        return cached[1], cached[2]
+
+    subdirs: list[str] = []
+    files: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    else:
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return frozenset(), []
+    subdir_set = frozenset(subdirs)
+    if time.time_ns() - st.st_mtime_ns > _DIR_MTIME_SLACK_NS:
+        _dir_cache[path] = (st.st_mtime_ns, subdir_set, files)
+    return subdir_set, files
+
+
+def _iter_jsonl_files(base_dir: str) -> Iterator[str]:
+    """Yield ``*.jsonl`` paths under *base_dir*, pruning ``subagents`` dirs.
+
+    Sub-agent transcripts are attributed to their parent session, so their
+    directories are never descended into.
+    """
+    stack = [base_dir]
+    while stack:
+        path = stack.pop()
+        subdirs, files = _list_dir(path)
+        for name in subdirs:
+            if name != "subagents":
+                stack.append(os.path.join(path, name))
+        for name in files:
+            if name.endswith(".jsonl"):
+                yield os.path.join(path, name)
+
+
+def _count_subagents(path: Path, session_id: str) -> int:
+    """Count ``agent-*.jsonl`` transcripts belonging to a Claude session.
+
+    Sub-agents live in ``<stem>/subagents`` or ``<session_id>/subagents``
+    next to the transcript.  Both candidates are tested against the parent's
+    cached listing, which the directory walk has already populated, instead
+    of probing each with its own ``stat``.
+    """
+    parent = str(path.parent)
+    subdirs, _ = _list_dir(parent)
+    for name in (path.stem, session_id):
+        if name not in subdirs:
+            continue
+        child = os.path.join(parent, name)
+        if "subagents" not in _list_dir(child)[0]:
+            continue
+        _, files = _list_dir(os.path.join(child, "subagents"))
+        return sum(1 for f in files if f.startswith("agent-") and f.endswith(".jsonl"))
+    return 0
+
+
+def _count_remaining_lines(f: BinaryIO) -> int:
+    """Count lines from the current position of *f* to EOF.
+
+    ``bytes.count`` runs as a memchr-style C scan, so this proceeds at
+    roughly memory bandwidth in 1 MiB chunks.  A final line without a
+    trailing newline still counts, matching line iteration.
+    """
+    count = 0
+    last = b"\n"
+    while True:
+        chunk = f.read(1 << 20)
+        if not chunk:
+            break
+        count += chunk.count(b"\n")
+        last = chunk[-1:]
+    if last != b"\n":
+        count += 1
+    return count
+
+
+@dataclass(slots=True)
+class _Metadata:
+    """Session metadata gathered from the head of a JSONL transcript."""
+
+    session_id: str
+    slug: str = ""
+    branch: str = ""
+    total_in: int = 0
+    total_out: int = 0
+    total_cache: int = 0
+    line_count: int = 0
+
+
+def _iter_head_records(f: BinaryIO, meta: _Metadata) -> Iterator[dict]:
+    """Yield decoded records from the first ``_METADATA_LINES`` lines of *f*.
+
+    Every line read is counted in ``meta.line_count``, including blank and
+    malformed ones, so the caller can continue counting from the current
+    position of *f*.
+    """
+    for _ in range(_METADATA_LINES):
+        line = f.readline()
+        if not line:
+            break
+        meta.line_count += 1
+        stripped = line.strip()
+        if not stripped:
+            continue
+        try:
+            rec = orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            continue
+        if isinstance(rec, dict):
+            yield rec
+
+
+def _read_metadata_claude(f: BinaryIO, session_id: str) -> _Metadata:
+    meta = _Metadata(session_id)
+    for rec in _iter_head_records(f, meta):
+        if "sessionId" in rec:
+            meta.session_id = rec["sessionId"]
+        if not meta.slug and rec.get("slug"):
+            meta.slug = rec["slug"]
+        if not meta.branch and rec.get("gitBranch"):
+            meta.branch = rec["gitBranch"]
+        if rec.get("type") == "assistant":
+            usage = rec.get("message", {}).get("usage", {})
+            meta.total_in += usage.get("input_tokens", 0)
+            meta.total_out += usage.get("output_tokens", 0)
+            meta.total_cache += usage.get("cache_read_input_tokens", 0)
+    return meta
+
+
+def _read_metadata_codex(f: BinaryIO, session_id: str) -> _Metadata:
+    meta = _Metadata(session_id)
+    for rec in _iter_head_records(f, meta):
+        rec_type = rec.get("type")
+        if rec_type == "session_meta":
+            meta.session_id = rec.get("session_id", meta.session_id)
+        elif rec_type == "event_msg":
+            payload = rec.get("payload", rec.get("msg", {}))
+            if isinstance(payload, dict) and payload.get("type") == "token_count":
+                info = payload.get("info", {})
+                usage = info.get("last_token_usage", {})
+                meta.total_in += usage.get("input_tokens", 0)
+                meta.total_out += usage.get("output_tokens", 0)
+    return meta
+
+
+def _read_metadata_gemini(f: BinaryIO, session_id: str) -> _Metadata:
+    meta = _Metadata(session_id)
+    for rec in _iter_head_records(f, meta):
+        rec_type = rec.get("type")
+        if rec_type == "session_metadata":
+            meta.session_id = rec.get("sessionId", meta.session_id)
+        elif rec_type == "message_update":
+            tokens = rec.get("tokens", {})
+            meta.total_in += tokens.get("input", 0)
+            meta.total_out += tokens.get("output", 0)
+    return meta
+
+
+# Source-specific metadata extraction, chosen once per file so the per-line
+# loop never re-checks the source
+_METADATA_READERS = {
+    "claude": _read_metadata_claude,
+    "codex": _read_metadata_codex,
+    "gemini": _read_metadata_gemini,
+}
+
+
 def _build_summary(
-    path: Path, source: str, now: float
+    path: Path, source: str, now: float, stat: os.stat_result | None = None
 ) -> SessionSummary | None:
-    """Build a SessionSummary from a single session file."""
-    stat = path.stat()
+    """Build a SessionSummary from a single session file.
+
+    *stat* may be passed when the caller already has it to skip a
+    redundant ``stat()`` call.
+    """
+    if stat is None:
+        stat = path.stat()
     mtime = stat.st_mtime
     is_active = (now - mtime) < ACTIVE_THRESHOLD
 
@@ -151,67 +457,23 @@ def _build_summary(
             return None
     else:
         # JSONL format (Claude, Codex, Gemini JSONL)
-        # Single pass: count lines and extract metadata from first 20 lines
-        with open(path, encoding="utf-8", errors="ignore") as f:
-            for i, line in enumerate(f):
-                line_count += 1
-
-                # Extract metadata from the first 20 lines only
-                if i >= 20:
-                    continue
-                stripped = line.strip()
-                if not stripped:
-                    continue
-                try:
-                    rec = json.loads(stripped)
-                except json.JSONDecodeError:
-                    continue
-
-                # Claude Code metadata
-                if source == "claude":
-                    if "sessionId" in rec:
-                        session_id = rec["sessionId"]
-                    if not slug and rec.get("slug"):
-                        slug = rec["slug"]
-                    if not branch and rec.get("gitBranch"):
-                        branch = rec["gitBranch"]
-                    if rec.get("type") == "assistant":
-                        usage = rec.get("message", {}).get("usage", {})
-                        total_in += usage.get("input_tokens", 0)
-                        total_out += usage.get("output_tokens", 0)
-                        total_cache += usage.get("cache_read_input_tokens", 0)
-
-                # Codex metadata
-                elif source == "codex":
-                    if rec.get("type") == "session_meta":
-                        session_id = rec.get("session_id", session_id)
-                    if rec.get("type") == "event_msg":
-                        payload = rec.get("payload", rec.get("msg", {}))
-                        if isinstance(payload, dict) and payload.get("type") == "token_count":
-                            info = payload.get("info", {})
-                            usage = info.get("last_token_usage", {})
-                            total_in += usage.get("input_tokens", 0)
-                            total_out += usage.get("output_tokens", 0)
-
-                # Gemini JSONL metadata
-                elif source == "gemini":
-                    if rec.get("type") == "session_metadata":
-                        session_id = rec.get("sessionId", session_id)
-                    if rec.get("type") == "message_update":
-                        tokens = rec.get("tokens", {})
-                        total_in += tokens.get("input", 0)
-                        total_out += tokens.get("output", 0)
+        # Extract metadata from the first 20 lines, then count the remaining
+        # newlines in bulk rather than iterating every line in Python
+        read_metadata = _METADATA_READERS.get(source, _read_metadata_claude)
+        with open(path, "rb") as f:
+            meta = read_metadata(f, session_id)
+            line_count = meta.line_count + _count_remaining_lines(f)
+        session_id = meta.session_id
+        slug = meta.slug
+        branch = meta.branch
+        total_in = meta.total_in
+        total_out = meta.total_out
+        total_cache = meta.total_cache
 
     # Check for subagent dirs (Claude only)
     agent_count = 1
     if source == "claude":
-        for candidate_dir in [
-            path.parent / path.stem / "subagents",
-            path.parent / session_id / "subagents",
-        ]:
-            if candidate_dir.is_dir():
-                agent_count += len(list(candidate_dir.glob("agent-*.jsonl")))
-                break
+        agent_count += _count_subagents(path, session_id)
 
     # Project name from directory structure
     project_name = path.parent.name
@@ -4,24 +4,36 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import atexit
+import collections
+import functools
 import hashlib
+import heapq
 import logging
 import os
+import random
 import re
 import sys
+import threading
 import webbrowser
+from contextlib import aclosing, asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator
 
 import time
 
 import httpx
+import orjson
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from watchfiles import Change, watch
 
 from . import __version__, llm
+from .models import SessionSummary
 from .parser import parse
-from .scanner import scan_sessions
+from .scanner import scan_sessions, session_roots
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +43,30 @@ WEB_DIR = Path(__file__).parent.parent / "web"
 _data_dir_env = os.environ.get("AGENTSTV_DATA_DIR")
 DATA_DIR: Path | None = Path(_data_dir_env) if _data_dir_env else None
 
-app = FastAPI(title="agent-replay")
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    # Stop the shared file watcher and close pooled LLM connections on shutdown
+    _stop_watcher()
+    await llm.aclose()
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson rather than the stdlib encoder."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+app = FastAPI(
+    title="agent-replay",
+    lifespan=_lifespan,
+    default_response_class=_ORJSONResponse,
+)
+# Session JSON compresses 40x or more; level 1 gets nearly all of that at
+# a fraction of the CPU of higher levels
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
 
 # Public mode — redacts sensitive content before sending to clients
 PUBLIC_MODE = False
@@ -42,77 +77,332 @@ _path_map: dict[str, str] = {}
 # Maximum length for user chat messages
 MAX_MESSAGE_LENGTH = 2000
 
-# Patterns that look like secrets
-_SECRET_PATTERNS = re.compile(
-    r'(?i)'
-    r'(?:'
-    r'(?:api[_-]?key|apikey|secret[_-]?key|access[_-]?token|auth[_-]?token'
-    r'|password|passwd|pwd|bearer|authorization|private[_-]?key'
-    r'|client[_-]?secret|refresh[_-]?token|session[_-]?token'
-    r'|database[_-]?url|connection[_-]?string|dsn'
-    r'|aws[_-]?secret|stripe[_-]?sk|sk[_-]live|sk[_-]test'
-    r')\s*[=:]\s*\S+'
-    r'|(?:ghp_|gho_|github_pat_|xox[bpsar]-|slack_|AKIA)[A-Za-z0-9_-]{10,}'
-    r'|[A-Za-z0-9+/]{40,}'  # long base64-ish strings
-    r'|eyJ[A-Za-z0-9_-]{20,}'  # JWT tokens
-    r')'
+# Patterns that look like secrets, one per kind.  Written in lower case and
+# matched case-sensitively against a case-folded copy of the text (see
+# _fold_case): under (?i) the engine re-tests every keyword at every position.
+# They are scanned separately — a single alternation tries every branch at
+# every position — and _iter_secret_spans merges the hits back into the
+# alternation's order.  Keywords are grouped by leading letters so most
+# positions are rejected after one character.
+_SECRET_PATTERNS = (
+    re.compile(
+        r'(?:a(?:pi[_-]?key|pikey|ccess[_-]?token|uth[_-]?token|uthorization|ws[_-]?secret)'
+        r'|s(?:ecret[_-]?key|ession[_-]?token|tripe[_-]?sk|k[_-](?:live|test))'
+        r'|p(?:assword|asswd|wd|rivate[_-]?key)'
+        r'|c(?:lient[_-]?secret|onnection[_-]?string)'
+        r'|d(?:atabase[_-]?url|sn)'
+        r'|bearer|refresh[_-]?token'
+        r')\s*[=:]\s*\S+'
+    ),
+    re.compile(r'(?:ghp_|gho_|github_pat_|xox[bpsar]-|slack_|akia)[a-z0-9_-]{10,}'),
+    # Long base64-ish strings.  Deliberately unbounded: a greedy run is
+    # matched in one linear pass, while an upper bound plus boundary
+    # assertions would stop matching (and leak) blobs longer than the bound
+    re.compile(r'[a-z0-9+/]{40,}'),
+    re.compile(r'eyj[a-z0-9_-]{20,}'),  # JWT tokens
 )
 
+# Non-ASCII characters that (?i) matching equates with ASCII letters but
+# str.lower() leaves alone; U+0130 would also lengthen the string
+_CASE_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
 # Full paths patterns (Windows and Unix)
 _PATH_PATTERN = re.compile(
     r'(?:[A-Z]:\\|/(?:home|Users|mnt|var|etc|opt|tmp)/)\S+'
 )
 
+# Quoting and bracketing that can trail a path match in prose or code
+_PATH_TRAILING = '",\'`;:)]}>'
+
+
+def _fold_case(text: str) -> str:
+    """Lower-case *text* the way (?i) compares ASCII letters, keeping its length.
+
+    Every character maps to exactly one character, so match offsets in the
+    folded copy are valid offsets into the original.
+    """
+    if not text.isascii() and ("\u0130" in text or "\u0131" in text or "\u017f" in text):
+        text = text.translate(_CASE_FOLD)
+    return text.lower()
+
+
+def _iter_secret_spans(folded: str) -> Iterator[tuple[int, int]]:
+    """Yield secret spans in *folded* as one alternation of the patterns would.
+
+    At each step the leftmost next match across all patterns wins, ties going
+    to the earlier pattern, and scanning resumes after it.  A pattern's next
+    match is only searched again once an earlier winner overlaps it.
+    """
+    pending = [p.search(folded) for p in _SECRET_PATTERNS]
+    pos = 0
+    while True:
+        best = None
+        for i, m in enumerate(pending):
+            if m is not None and m.start() < pos:
+                m = pending[i] = _SECRET_PATTERNS[i].search(folded, pos)
+            if m is not None and (best is None or m.start() < best.start()):
+                best = m
+        if best is None:
+            return
+        yield best.span()
+        pos = best.end()
+
+
+# Only this much text is memoized per entry; sessions are re-redacted on
+# every public-mode read and WebSocket push, but caching huge tool output
+# would pin memory for strings that rarely repeat
+_REDACT_CACHE_MAX_INPUT = 8192
+
 
 def _redact_text(text: str) -> str:
     """Redact secrets and full paths from text."""
     if not text:
         return text
-    # Redact secret-like patterns
-    text = _SECRET_PATTERNS.sub('[REDACTED]', text)
-    # Redact full file paths, keep just the filename
-    def _path_to_name(m: re.Match) -> str:
-        p = m.group(0).rstrip('",\'`;:)]}>').rstrip()
-        name = Path(p).name
-        return f'…/{name}'
-    text = _PATH_PATTERN.sub(_path_to_name, text)
-    return text
-
-
-def _redact_event(evt: dict) -> dict:
-    """Redact sensitive fields from an event dict."""
+    if len(text) <= _REDACT_CACHE_MAX_INPUT:
+        return _redact_text_cached(text)
+    return _scrub_text(text)
+
+
+def _scrub_text(text: str) -> str:
+    # Redact secret-like patterns, splicing spans found in the folded copy
+    parts = []
+    last = 0
+    for start, end in _iter_secret_spans(_fold_case(text)):
+        parts.append(text[last:start])
+        parts.append('[REDACTED]')
+        last = end
+    if parts:
+        parts.append(text[last:])
+        text = ''.join(parts)
+    # Redact full file paths, keep just the filename; every path match
+    # contains "/" or ":\", so text with neither skips the scan
+    if '/' not in text and ':\\' not in text:
+        return text
+    return _PATH_PATTERN.sub(_path_to_name, text)
+
+
+def _path_to_name(m: re.Match) -> str:
+    # \S+ never ends in whitespace, so trailing punctuation is all to strip
+    return f'…/{_basename(m.group(0).rstrip(_PATH_TRAILING))}'
+
+
+def _basename(path: str) -> str:
+    """Return the last component of a Unix or Windows path.
+
+    Plain string slicing instead of ``Path(...).name``, which is slower and,
+    on a POSIX host, treats a whole Windows path as a single name.  Trailing
+    separators and ``.`` components are skipped the way pathlib skips them.
+    """
+    while True:
+        path = path.rstrip('/\\')
+        cut = max(path.rfind('/'), path.rfind('\\'))
+        name = path[cut + 1:]
+        if name != '.' or cut < 0:
+            return name
+        path = path[:cut]
+
+
+_redact_text_cached = functools.lru_cache(maxsize=4096)(_scrub_text)
+
+
+def _redact_event_inplace(evt: dict) -> dict:
+    """Redact an event dict the caller owns, such as a fresh to_dict()."""
     if not PUBLIC_MODE:
         return evt
-    evt = dict(evt)  # shallow copy
-    evt['content'] = _redact_text(evt.get('content', ''))
-    evt['summary'] = _redact_text(evt.get('summary', ''))
+    content = evt.get('content', '')
+    summary = evt.get('summary', '')
+    evt['content'] = redacted = _redact_text(content)
+    # A one-line content is its own summary (the same object), so the
+    # redacted content is reused instead of scanning it again
+    evt['summary'] = redacted if summary is content else _redact_text(summary)
     # Only show filename, not full path
     if evt.get('file_path'):
-        evt['file_path'] = Path(evt['file_path']).name
-        evt['short_path'] = evt['file_path']
+        evt['file_path'] = evt['short_path'] = _basename(evt['file_path'])
     return evt
 
 
-def _redact_session(data: dict) -> dict:
-    """Redact a full session dict."""
+def _redact_events_inplace(events: list[dict]) -> None:
+    """Redact a list of caller-owned event dicts without copying them."""
     if not PUBLIC_MODE:
-        return data
-    data = dict(data)
-    data['events'] = [_redact_event(e) for e in data.get('events', [])]
+        return
+    for evt in events:
+        _redact_event_inplace(evt)
+
+
+def _redact_session(data: dict) -> dict:
+    """Redact a full session dict in place; *data* must be caller-owned."""
+    _redact_events_inplace(data.get('events', []))
     return data
 
 
-def _redact_summary(s: dict) -> dict:
-    """Redact a session summary dict."""
+def _load_redacted_sync(file_path: Path) -> dict:
+    return _redact_session(parse(file_path).to_dict())
+
+
+async def _load_redacted(file_path: Path) -> dict:
+    """Parse a session and serialize and redact it, all on a worker thread."""
+    return await asyncio.to_thread(_load_redacted_sync, file_path)
+
+
+# Redacted sessions behind the LLM prompt contexts, keyed by path and checked
+# against the file's (size, mtime_ns): viewer chat, narrator and chat replies
+# poll the same session and share one parse + redaction
+_CONTEXT_CACHE_MAX = 16
+_context_cache: dict[str, tuple[tuple[int, int], bool, dict]] = {}
+
+
+async def _get_session_data(file_path: Path) -> dict:
+    """Return the redacted session dict for *file_path*; treat as read-only."""
+    key = str(file_path)
+    stamp = _file_stat_key(file_path)
+    cached = _context_cache.get(key)
+    if cached is not None and cached[0] == stamp and cached[1] == PUBLIC_MODE:
+        return cached[2]
+    data = await _load_redacted(file_path)
+    _context_cache.pop(key, None)
+    while len(_context_cache) >= _CONTEXT_CACHE_MAX:
+        del _context_cache[next(iter(_context_cache))]
+    _context_cache[key] = (stamp, PUBLIC_MODE, data)
+    return data
+
+
+async def _get_context(session_id: str, n: int = 5) -> str | None:
+    """Build the LLM prompt context for a session, or None if it's not found."""
+    file_path = await _resolve_session_path(session_id)
+    if not file_path:
+        return None
+    return _build_context(await _get_session_data(file_path), n=n)
+
+
+def _redact_summaries(summaries: list[dict]) -> list[dict]:
+    """Redact session summary dicts in place; the list must be caller-owned."""
     if not PUBLIC_MODE:
-        return s
-    s = dict(s)
+        return summaries
     # Replace file path with hash, store mapping for lookups
-    if s.get('file_path'):
-        hashed = hashlib.md5(s['file_path'].encode()).hexdigest()[:12]
-        _path_map[hashed] = s['file_path']
-        s['file_path'] = hashed
-    return s
+    for s in summaries:
+        if s.get('file_path'):
+            s['file_path'] = _hash_path(s['file_path'])
+    return summaries
+
+
+@functools.lru_cache(maxsize=4096)
+def _hash_path(file_path: str) -> str:
+    """Return a 12-hex-digit id for *file_path*, recorded in ``_path_map``."""
+    hashed = hashlib.blake2b(file_path.encode(), digest_size=6).hexdigest()
+    _path_map[hashed] = file_path
+    return hashed
+
+
+# How long one filesystem scan is reused; the dashboard, master channel and
+# REST polls from every client share it instead of each walking DATA_DIR.
+# Callers that poll slowly accept an older scan, interactive ones a fresher.
+# A scan taken before the file watcher's latest batch is never reused.
+_SCAN_TTL = 1.5
+_SCAN_TTL_SESSIONS = 1.0
+_SCAN_TTL_MASTER = 2.0
+_SCAN_TTL_DASHBOARD = 2.0
+_scan_cache: tuple[float, int, list, dict[str, str]] | None = None
+_scan_cache_lock = asyncio.Lock()
+
+
+def _scan_with_index() -> tuple[list, dict[str, str]]:
+    """Scan DATA_DIR and index each session's file path by id and by path.
+
+    The first summary wins a key, matching a linear search of the list.
+    """
+    summaries = scan_sessions(DATA_DIR)
+    index: dict[str, str] = {}
+    for s in summaries:
+        index.setdefault(s.id, s.file_path)
+        index.setdefault(s.file_path, s.file_path)
+    return summaries, index
+
+
+async def _cached_scan_result(ttl: float) -> tuple[list, dict[str, str]]:
+    global _scan_cache
+    async with _scan_cache_lock:
+        if (
+            _scan_cache is None
+            or _scan_cache[1] != _watch_batches
+            or time.monotonic() - _scan_cache[0] >= ttl
+        ):
+            batches = _watch_batches
+            summaries, index = await asyncio.to_thread(_scan_with_index)
+            _scan_cache = (time.monotonic(), batches, summaries, index)
+        return _scan_cache[2], _scan_cache[3]
+
+
+async def _cached_scan(ttl: float = _SCAN_TTL) -> list:
+    """Return scan_sessions(DATA_DIR), reusing a result younger than *ttl*.
+
+    The returned list is shared between callers and must not be mutated.
+    """
+    return (await _cached_scan_result(ttl))[0]
+
+
+# Serialized (and in public mode redacted) summaries for the scan they were
+# built from; /api/sessions and every dashboard socket send the same list
+_summary_dicts_cache: tuple[list, bool, list[dict]] | None = None
+
+
+async def _cached_summary_dicts(ttl: float = _SCAN_TTL) -> list[dict]:
+    """Return the cached scan as redacted summary dicts; must not be mutated."""
+    global _summary_dicts_cache
+    summaries = await _cached_scan(ttl)
+    cached = _summary_dicts_cache
+    if cached is None or cached[0] is not summaries or cached[1] != PUBLIC_MODE:
+        dicts = _redact_summaries([s.to_dict() for s in summaries])
+        _summary_dicts_cache = cached = (summaries, PUBLIC_MODE, dicts)
+    return cached[2]
+
+
+# The encoded dashboard message for the summary dicts it was built from;
+# every dashboard socket sends the same frame
+_dashboard_frame_cache: tuple[list[dict], str] | None = None
+
+
+async def _dashboard_frame() -> str:
+    """Return the dashboard's "sessions" message as JSON text."""
+    global _dashboard_frame_cache
+    data = await _cached_summary_dicts(_SCAN_TTL_DASHBOARD)
+    cached = _dashboard_frame_cache
+    if cached is None or cached[0] is not data:
+        frame = orjson.dumps({"type": "sessions", "data": data}).decode()
+        _dashboard_frame_cache = cached = (data, frame)
+    return cached[1]
+
+
+async def _cached_session_index(ttl: float = _SCAN_TTL) -> dict[str, str]:
+    """Return {session id or file path: file path} for the cached scan."""
+    return (await _cached_scan_result(ttl))[1]
+
+
+# Session ids already resolved through a scan, oldest first
+_ID_TO_PATH_MAX = 256
+_id_to_path: dict[str, str] = {}
+
+
+def _is_path_like(session_id: str) -> bool:
+    """Whether *session_id* is a file path rather than a bare session id."""
+    return (
+        "/" in session_id
+        or "\\" in session_id
+        or (len(session_id) > 1 and session_id[1] == ":")
+    )
+
+
+# DATA_DIR as given, its resolved form, and that form plus a separator;
+# resolved once rather than on every request
+_allowed_root_cache: tuple[Path, str, str] | None = None
+
+
+def _allowed_root() -> tuple[str, str]:
+    """Return the resolved DATA_DIR and its prefix for the traversal guard."""
+    global _allowed_root_cache
+    if _allowed_root_cache is None or _allowed_root_cache[0] is not DATA_DIR:
+        allowed = os.path.realpath(DATA_DIR)
+        _allowed_root_cache = (DATA_DIR, allowed, allowed + os.sep)
+    return _allowed_root_cache[1], _allowed_root_cache[2]
 
 
 async def _resolve_session_path(session_id: str) -> Path | None:
@@ -125,23 +415,34 @@ async def _resolve_session_path(session_id: str) -> Path | None:
     real_path = _path_map.get(session_id, session_id)
     file_path = Path(real_path)
 
-    if not file_path.exists():
-        # Try finding by session ID in known locations
-        summaries = await asyncio.to_thread(scan_sessions, DATA_DIR)
-        for s in summaries:
-            if s.id == session_id or s.file_path == session_id:
-                file_path = Path(s.file_path)
-                break
-
-    if not file_path.exists():
+    # A path-shaped id either exists or is simply missing; only bare session
+    # ids are looked up, first in the id cache and then in a scan. Each
+    # candidate is stat'ed once.
+    exists = file_path.exists()
+    if not exists and not _is_path_like(real_path):
+        cached = _id_to_path.get(session_id)
+        if cached is not None and os.path.exists(cached):
+            file_path = Path(cached)
+            exists = True
+        else:
+            _id_to_path.pop(session_id, None)
+            found = (await _cached_session_index()).get(session_id)
+            if found is not None:
+                if len(_id_to_path) >= _ID_TO_PATH_MAX:
+                    del _id_to_path[next(iter(_id_to_path))]
+                _id_to_path[session_id] = found
+                file_path = Path(found)
+                exists = file_path.exists()
+
+    if not exists:
         return None
 
     # Path traversal guard: resolved path must be under DATA_DIR
     if DATA_DIR is not None:
         try:
-            resolved = file_path.resolve()
-            allowed = DATA_DIR.resolve()
-            if not str(resolved).startswith(str(allowed) + os.sep) and resolved != allowed:
+            resolved = os.path.realpath(file_path)
+            allowed, allowed_prefix = _allowed_root()
+            if not resolved.startswith(allowed_prefix) and resolved != allowed:
                 logger.warning("Path traversal blocked: %s is not under %s", resolved, allowed)
                 return None
         except (OSError, ValueError) as exc:
@@ -151,7 +452,8 @@ async def _resolve_session_path(session_id: str) -> Path | None:
     return file_path
 
 
-app.mount("/static", StaticFiles(directory=str(WEB_DIR)), name="static")
+_static_files = StaticFiles(directory=str(WEB_DIR))
+app.mount("/static", _static_files, name="static")
 
 
 @app.get("/api/ollama-models")
@@ -205,8 +507,7 @@ async def post_chat(request: Request):
         try:
             file_path = await _resolve_session_path(session_id)
             if file_path:
-                session = parse(file_path)
-                session_data = _redact_session(session.to_dict())
+                session_data = await _get_session_data(file_path)
                 context = _build_context(session_data, n=8)
                 # Extract specific event if replying to one
                 events = session_data.get("events", [])
@@ -226,8 +527,11 @@ async def post_chat(request: Request):
 
 
 @app.get("/", response_class=HTMLResponse)
-async def index():
-    return FileResponse(WEB_DIR / "index.html")
+async def index(request: Request):
+    # Served like a static file, so an unchanged page revalidates to a 304
+    response = await _static_files.get_response("index.html", request.scope)
+    response.headers["cache-control"] = "no-cache"
+    return response
 
 
 @app.get("/api/settings")
@@ -255,8 +559,7 @@ async def put_settings(request: Request):
 
 @app.get("/api/sessions")
 async def list_sessions():
-    summaries = await asyncio.to_thread(scan_sessions, DATA_DIR)
-    return [_redact_summary(s.to_dict()) for s in summaries]
+    return _ORJSONResponse(await _cached_summary_dicts(_SCAN_TTL_SESSIONS))
 
 
 @app.get("/api/session-preview/{session_id:path}")
@@ -268,7 +571,7 @@ async def get_session_preview(session_id: str):
     try:
         session = await asyncio.to_thread(parse, file_path)
         for evt in reversed(session.events):
-            d = _redact_event(evt.to_dict())
+            d = _redact_event_inplace(evt.to_dict())
             if d.get("content") and len(d["content"]) > 10:
                 return {"content": d["content"], "type": d.get("type", "")}
     except Exception:
@@ -282,17 +585,39 @@ async def get_session(session_id: str):
     file_path = await _resolve_session_path(session_id)
     if not file_path:
         return {"error": "Session not found"}
-    session = parse(file_path)
-    return _redact_session(session.to_dict())
+    if not PUBLIC_MODE:
+        session = await asyncio.to_thread(parse, file_path)
+        return Response(session.to_json(), media_type="application/json")
+    return _ORJSONResponse(await _load_redacted(file_path))
+
 
+# Most pre-generated messages kept per session and buffer
+_BUFFER_MAXLEN = 32
 
 # Buffer of pre-generated viewer chat messages per session
-_chat_buffers: dict[str, list[dict]] = {}
-_chat_lock = asyncio.Lock()
+_chat_buffers: dict[str, collections.deque[dict]] = {}
+_chat_locks: dict[str, asyncio.Lock] = {}
 
 # Buffer of pre-generated narrator messages per session
-_narrator_buffers: dict[str, list[str]] = {}
-_narrator_lock = asyncio.Lock()
+_narrator_buffers: dict[str, collections.deque[str]] = {}
+_narrator_locks: dict[str, asyncio.Lock] = {}
+
+
+def _session_lock(locks: dict[str, asyncio.Lock], session_id: str) -> asyncio.Lock:
+    """Return the lock serializing buffer refills for *session_id*.
+
+    It is held across the LLM call, so a request that finds the buffer empty
+    generates once while later requests for the same session wait and then
+    pop from the refilled buffer; other sessions proceed independently.
+    """
+    lock = locks.get(session_id)
+    if lock is None:
+        lock = locks[session_id] = asyncio.Lock()
+    return lock
+
+# Picks viewer names and fallback phrasing; a dedicated instance skips the
+# module-level random.choice indirection on every chat request
+_rng = random.Random()
 
 VIEWER_NAMES = [
     'viewer_42', 'code_fan99', 'pixel_dev', 'stream_lurker', 'bug_hunter',
@@ -334,9 +659,8 @@ def _build_context(session_data: dict, n: int = 5) -> str:
         lines.append(" ".join(parts))
     if lines:
         return "\n".join(lines)
-    import random
     names = ["The coder", "Our code monkey", "The engineer", "Master coder", "The dev"]
-    return f"{random.choice(names)} is working on a project."
+    return f"{_rng.choice(names)} is working on a project."
 
 
 async def _is_session_active(session_id: str) -> bool:
@@ -356,59 +680,50 @@ async def _is_session_active(session_id: str) -> bool:
 @app.get("/api/viewer-chat/{session_id:path}")
 async def viewer_chat(session_id: str):
     """Return a generated viewer chat message for the session."""
-    import random
-
     # Skip LLM for inactive sessions — return empty so client uses fallback
     if not await _is_session_active(session_id):
         return {"name": "", "message": ""}
 
-    # Phase 1: Check buffer under lock
-    async with _chat_lock:
-        buf = _chat_buffers.get(session_id, [])
+    async with _session_lock(_chat_locks, session_id):
+        # Phase 1: Serve from the buffer
+        buf = _chat_buffers.get(session_id)
         if buf:
-            item = buf.pop(0)
-            _chat_buffers[session_id] = buf
-            return item
+            return buf.popleft()
 
-    # Phase 2: Generate new messages outside the lock (LLM call is slow)
-    llm_error = ""
-    buf = []
-    count = 5 if llm.LOW_POWER else 10
-    try:
-        context = None
-        if session_id == "__master__":
-            master_data = await get_master()
-            context = _build_context(master_data, n=10)
-        else:
-            file_path = await _resolve_session_path(session_id)
-            if file_path:
-                session = parse(file_path)
-                context = _build_context(
-                    _redact_session(session.to_dict())
-                )
+        # Phase 2: Generate new messages (LLM call is slow)
+        llm_error = ""
+        buf: collections.deque[dict] = collections.deque()
+        count = 5 if llm.LOW_POWER else 10
+        try:
+            context = None
+            if session_id == "__master__":
+                master_data = await _master_payload()
+                context = _build_context(master_data, n=10)
+            else:
+                context = await _get_context(session_id)
 
-        if context:
-            messages, llm_error = await llm.generate_viewer_messages(
-                context, count=count
-            )
-            if messages:
-                buf = [
-                    {
-                        "name": random.choice(VIEWER_NAMES),
-                        "message": msg,
-                    }
-                    for msg in messages
-                ]
-    except Exception:
-        logger.exception("Failed to generate viewer chat for session %s", session_id)
+            if context:
+                messages, llm_error = await llm.generate_viewer_messages(
+                    context, count=count
+                )
+                if messages:
+                    buf = collections.deque(
+                        (
+                            {
+                                "name": _rng.choice(VIEWER_NAMES),
+                                "message": msg,
+                            }
+                            for msg in messages
+                        ),
+                        maxlen=_BUFFER_MAXLEN,
+                    )
+        except Exception:
+            logger.exception("Failed to generate viewer chat for session %s", session_id)
 
-    # Phase 3: Store results and pop one item under lock
-    if buf:
-        async with _chat_lock:
-            _chat_buffers[session_id] = buf
-            item = buf.pop(0)
+        # Phase 3: Store results and pop one item
+        if buf:
             _chat_buffers[session_id] = buf
-            return item
+            return buf.popleft()
 
     # Fallback — empty means client should use hardcoded messages
     resp: dict = {"name": "", "message": ""}
@@ -420,8 +735,6 @@ async def viewer_chat(session_id: str):
 @app.post("/api/viewer-react")
 async def viewer_react(request: Request):
     """Generate 1-2 viewer reactions to a user's chat message."""
-    import random
-
     body = await request.json()
     user_message = body.get("message", "").strip()
     if not user_message:
@@ -435,7 +748,7 @@ async def viewer_react(request: Request):
 
     messages = await llm.generate_viewer_reaction(user_message)
     reactions = [
-        {"name": random.choice(VIEWER_NAMES), "message": msg}
+        {"name": _rng.choice(VIEWER_NAMES), "message": msg}
         for msg in messages
     ]
     return {"reactions": reactions}
@@ -448,70 +761,233 @@ async def narrator_chat(session_id: str):
     if not await _is_session_active(session_id):
         return {"message": ""}
 
-    # Phase 1: Check buffer under lock
-    async with _narrator_lock:
-        buf = _narrator_buffers.get(session_id, [])
+    async with _session_lock(_narrator_locks, session_id):
+        # Phase 1: Serve from the buffer
+        buf = _narrator_buffers.get(session_id)
+        if buf:
+            return {"message": buf.popleft()}
+
+        # Phase 2: Generate new messages (LLM call is slow)
+        buf: collections.deque[str] = collections.deque()
+        try:
+            context = await _get_context(session_id, n=10)
+            if context:
+                messages = await llm.generate_narrator_messages(context, count=3)
+                if messages:
+                    buf = collections.deque(messages, maxlen=_BUFFER_MAXLEN)
+        except Exception:
+            logger.exception("Failed to generate narrator message for session %s", session_id)
+
+        # Phase 3: Store results and pop one item
         if buf:
-            item = buf.pop(0)
             _narrator_buffers[session_id] = buf
-            return {"message": item}
+            return {"message": buf.popleft()}
+
+    return {"message": ""}
+
+
+# One filesystem watcher thread over the session roots serves every live
+# channel; each open WebSocket registers a (loop, match, wake) entry and is
+# woken when a changed path satisfies its match.  A watcher per connection
+# would hold a thread per viewer.  It runs only while some channel is open.
+_watch_subscribers: set[tuple[asyncio.AbstractEventLoop, Callable[[str], bool], asyncio.Event]] = set()
+_watch_lock = threading.RLock()
+_watcher: tuple[threading.Thread, threading.Event, list[str]] | None = None
+_watch_threads: list[threading.Thread] = []
+
+# Batches of transcript changes the watcher has reported; only its thread
+# increments it
+_watch_batches = 0
 
-    # Phase 2: Generate new messages outside the lock (LLM call is slow)
-    buf = []
+# Changes within this window are delivered as one batch
+_WATCH_DEBOUNCE_MS = 500
+
+# Even without notifications, live channels re-check their files this often,
+# covering a change that landed before the watcher started
+_WATCH_IDLE_SECONDS = 30.0
+
+
+def _is_transcript(change: Change, path: str) -> bool:
+    return path.endswith((".jsonl", ".json"))
+
+
+def _run_watcher(roots: list[str], stop: threading.Event) -> None:
+    """Wake the subscribers whose match accepts a changed path."""
+    global _watch_batches
     try:
-        file_path = await _resolve_session_path(session_id)
-        if file_path:
-            session = parse(file_path)
-            context = _build_context(
-                _redact_session(session.to_dict()), n=10
-            )
-            messages = await llm.generate_narrator_messages(context, count=3)
-            if messages:
-                buf = list(messages)
+        for changes in watch(
+            *roots,
+            watch_filter=_is_transcript,
+            debounce=_WATCH_DEBOUNCE_MS,
+            stop_event=stop,
+            raise_interrupt=False,
+        ):
+            _watch_batches += 1
+            paths = {path for _, path in changes}
+            with _watch_lock:
+                subscribers = list(_watch_subscribers)
+            for loop, match, wake in subscribers:
+                if any(match(path) for path in paths):
+                    try:
+                        loop.call_soon_threadsafe(wake.set)
+                    except RuntimeError:
+                        pass  # the subscriber's loop has closed
     except Exception:
-        logger.exception("Failed to generate narrator message for session %s", session_id)
+        logger.exception("File watcher failed; live channels fall back to polling")
+
+
+def _start_watcher() -> None:
+    global _watcher
+    with _watch_lock:
+        if _watcher is None:
+            roots = [os.path.realpath(r) for r in session_roots(DATA_DIR)]
+            if roots:
+                stop = threading.Event()
+                thread = threading.Thread(
+                    target=_run_watcher, args=(roots, stop), name="agent-replay-watch", daemon=True
+                )
+                thread.start()
+                _watch_threads[:] = [t for t in _watch_threads if t.is_alive()]
+                _watch_threads.append(thread)
+                _watcher = (thread, stop, roots)
+
+
+def _stop_watcher() -> None:
+    """Ask the watcher thread to finish; it exits within one poll step."""
+    global _watcher
+    with _watch_lock:
+        if _watcher is not None:
+            _watcher[1].set()
+            _watcher = None
+
+
+@atexit.register
+def _stop_watcher_at_exit() -> None:
+    # Watcher threads, including ones still winding down, must release their
+    # native notifiers before interpreter teardown
+    _stop_watcher()
+    for thread in _watch_threads:
+        thread.join(timeout=1.0)
+
+
+def _watch_covers(path: str | None) -> bool:
+    """Whether the running watcher sees changes to *path* (None: any path)."""
+    watcher = _watcher
+    if watcher is None or not watcher[0].is_alive():
+        return False
+    return path is None or any(path.startswith(r + os.sep) for r in watcher[2])
 
-    # Phase 3: Store results and pop one item under lock
-    if buf:
-        async with _narrator_lock:
-            _narrator_buffers[session_id] = buf
-            item = buf.pop(0)
-            _narrator_buffers[session_id] = buf
-            return {"message": item}
 
-    return {"message": ""}
+async def _wait_for_disconnect(websocket: WebSocket, closed: asyncio.Event, wake: asyncio.Event) -> None:
+    """Flag *closed* and wake the channel once the client goes away.
+
+    Clients never send on the live channels, so the only message expected
+    is the disconnect.
+    """
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    except RuntimeError:
+        pass
+    finally:
+        closed.set()
+        wake.set()
+
+
+async def _watch_changes(
+    websocket: WebSocket,
+    match: Callable[[str], bool],
+    poll_interval: float,
+    path: str | None = None,
+    min_interval: float = 0.0,
+    idle_interval: float = _WATCH_IDLE_SECONDS,
+) -> AsyncIterator[None]:
+    """Yield whenever a watched path accepted by *match* may have changed.
+
+    *path* is the resolved file the channel follows, or None for any
+    transcript.  When the watcher doesn't cover it (or has died) this falls
+    back to yielding every *poll_interval* seconds, otherwise it still
+    yields after *idle_interval* seconds without a notification.  Yields
+    are at least *min_interval* apart.  Iteration ends when the client
+    disconnects.
+    """
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    closed = asyncio.Event()
+    subscriber = (loop, match, wake)
+    with _watch_lock:
+        _watch_subscribers.add(subscriber)
+    _start_watcher()
+    waiter = asyncio.create_task(_wait_for_disconnect(websocket, closed, wake))
+    last_yield = loop.time()
+    try:
+        while True:
+            timeout = idle_interval if _watch_covers(path) else poll_interval
+            try:
+                await asyncio.wait_for(wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            delay = last_yield + min_interval - loop.time()
+            if delay > 0 and not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            if closed.is_set():
+                return
+            wake.clear()
+            yield
+            last_yield = loop.time()
+    finally:
+        waiter.cancel()
+        with _watch_lock:
+            _watch_subscribers.discard(subscriber)
+            if not _watch_subscribers:
+                _stop_watcher()
 
 
 @app.websocket("/ws/session/{session_id:path}")
 async def ws_session(websocket: WebSocket, session_id: str):
-    """Live updates for a single session — polls file every 2s, sends deltas."""
+    """Live updates for a single session — sends deltas as the file changes."""
     await websocket.accept()
 
     file_path = await _resolve_session_path(session_id)
     if not file_path:
-        await websocket.send_json({"error": "Session not found"})
+        await _send_json(websocket, {"error": "Session not found"})
         await websocket.close()
         return
 
-    # Send initial full state
-    session = parse(file_path)
-    data = _redact_session(session.to_dict())
-    await websocket.send_json({"type": "full", "data": data})
-    last_count = len(session.events)
-    last_hash = _file_hash(file_path)
+    # Send initial full state.  The file is stat'ed before it is parsed so a
+    # write landing mid-parse still differs from last_key on the next check
+    last_key = _file_stat_key(file_path)
+    if PUBLIC_MODE:
+        data = await _load_redacted(file_path)
+        await _send_json(websocket, {"type": "full", "data": data})
+        last_count = len(data["events"])
+    else:
+        session = await asyncio.to_thread(parse, file_path)
+        await _send_json(websocket, {"type": "full", "data": session})
+        last_count = len(session.events)
 
+    # Notifications may report the path as given or with symlinks resolved
+    targets = {os.path.abspath(file_path), os.path.realpath(file_path)}
+    changes = _watch_changes(
+        websocket, targets.__contains__, poll_interval=2.0, path=os.path.realpath(file_path)
+    )
     try:
-        while True:
-            await asyncio.sleep(2)
-            current_hash = _file_hash(file_path)
-            if current_hash != last_hash:
-                last_hash = current_hash
-                session = parse(file_path)
+        async with aclosing(changes):
+            async for _ in changes:
+                current_key = _file_stat_key(file_path)
+                if current_key == last_key:
+                    continue
+                last_key = current_key
+                session = await asyncio.to_thread(parse, file_path)
                 if len(session.events) > last_count:
-                    new_events = [_redact_event(e.to_dict()) for e in session.events[last_count:]]
+                    new_events = [e.to_dict() for e in session.events[last_count:]]
+                    _redact_events_inplace(new_events)
                     # Also send updated agents (tokens may have changed)
                     agents = {k: v.to_dict() for k, v in session.agents.items()}
-                    await websocket.send_json({
+                    await _send_json(websocket, {
                         "type": "delta",
                         "events": new_events,
                         "agents": agents,
@@ -524,49 +1000,94 @@ async def ws_session(websocket: WebSocket, session_id: str):
         logger.exception("WebSocket error for session %s", session_id)
 
 
+# Bound on sessions parsed at once for the master channel, so one request
+# can't occupy the whole default thread pool
+_MASTER_PARSE_CONCURRENCY = 8
+_master_parse_semaphore = asyncio.Semaphore(_MASTER_PARSE_CONCURRENCY)
+
+# Most recent events returned by /api/master
+_MASTER_EVENT_LIMIT = 2000
+
+
+async def _parse_many(paths: list[str]) -> list:
+    """Parse several sessions concurrently on worker threads.
+
+    Results line up with *paths*; a session that failed to parse is
+    returned as its exception rather than raised.
+    """
+    async def _parse_one(path: str):
+        async with _master_parse_semaphore:
+            return await asyncio.to_thread(parse, path)
+
+    return await asyncio.gather(*(_parse_one(p) for p in paths), return_exceptions=True)
+
+
+def _tagged_event(evt, proj: str) -> dict:
+    """Serialize a master-channel event, tagged with its project and redacted."""
+    d = evt.to_dict()
+    d["project"] = proj
+    return _redact_event_inplace(d)
+
+
+def _add_tagged_agents(all_agents: dict, session, proj: str) -> None:
+    """Add *session*'s agents to *all_agents* under project-prefixed ids."""
+    for aid, agent in session.agents.items():
+        key = f"{proj}:{aid}"
+        ad = agent.to_dict()
+        ad["project"] = proj
+        ad["id"] = key
+        ad["name"] = f"{proj}/{agent.name}"
+        all_agents[key] = ad
+
+
 @app.get("/api/master")
 async def get_master():
     """Return merged events from all recent sessions for the master channel."""
-    summaries = await asyncio.to_thread(scan_sessions, DATA_DIR)
-    # Take the most recent session per project (top 20)
-    seen_projects: set[str] = set()
-    selected: list[dict] = []
+    # Returned as a response so FastAPI skips its jsonable_encoder walk
+    # over the ~2000 events
+    return _ORJSONResponse(await _master_payload())
+
+
+async def _master_payload() -> dict:
+    """Build the /api/master payload."""
+    summaries = await _cached_scan(_SCAN_TTL_MASTER)
+    # Take the most recent session per project (top 20); the first summary
+    # seen for a project is its newest and dict order keeps the ranking
+    latest: dict[str, SessionSummary] = {}
     for s in summaries:
-        if s.project_name in seen_projects:
-            continue
-        seen_projects.add(s.project_name)
-        selected.append(s.to_dict())
-        if len(selected) >= 20:
-            break
+        if s.project_name not in latest:
+            latest[s.project_name] = s
+            if len(latest) >= 20:
+                break
 
     # Parse each and merge events with project tags
-    all_events = []
     all_agents = {}
     # Need original file_paths before redaction for parsing
-    original_paths = {s["project_name"]: s["file_path"] for s in selected}
-    selected = [_redact_summary(s) for s in selected]
-
-    for proj, fpath in original_paths.items():
+    original_paths = {proj: s.file_path for proj, s in latest.items()}
+    selected = _redact_summaries([s.to_dict() for s in latest.values()])
+
+    parsed = await _parse_many(list(original_paths.values()))
+    event_runs = []
+    for proj, session in zip(original_paths, parsed):
+        if isinstance(session, BaseException):
+            logger.error("Failed to parse session for project %s", proj, exc_info=session)
+            continue
         try:
-            session = parse(Path(fpath))
-            for evt in session.events:
-                d = _redact_event(evt.to_dict())
-                d["project"] = proj
-                all_events.append(d)
-            for aid, agent in session.agents.items():
-                key = f"{proj}:{aid}"
-                ad = agent.to_dict()
-                ad["project"] = proj
-                ad["id"] = key
-                ad["name"] = f"{proj}/{agent.name}"
-                all_agents[key] = ad
+            # Each session's events are already in timestamp order, so only
+            # its last _MASTER_EVENT_LIMIT can make the merged tail
+            event_runs.append([(proj, evt) for evt in session.events[-_MASTER_EVENT_LIMIT:]])
+            _add_tagged_agents(all_agents, session, proj)
         except Exception:
             logger.exception("Failed to parse session for project %s", proj)
             continue
 
-    # Sort by timestamp, keep last 2000
-    all_events.sort(key=lambda e: e["timestamp"])
-    all_events = all_events[-2000:]
+    # Merge by timestamp (ties keep session order, like a stable sort) and
+    # keep the last _MASTER_EVENT_LIMIT; only survivors are serialized
+    merged = heapq.merge(*event_runs, key=lambda pe: pe[1].timestamp)
+    all_events = [
+        _tagged_event(evt, proj)
+        for proj, evt in collections.deque(merged, maxlen=_MASTER_EVENT_LIMIT)
+    ]
 
     return {
         "events": all_events,
@@ -578,20 +1099,32 @@ async def get_master():
 
 @app.websocket("/ws/master")
 async def ws_master(websocket: WebSocket):
-    """Live updates for master channel — polls all active sessions every 3s."""
+    """Live updates for master channel — re-reads active sessions on changes."""
     await websocket.accept()
     last_event_counts: dict[str, int] = {}
 
+    # Any transcript change may belong to an active session; at most one
+    # update a second, as parsing every active session is the costly part
+    changes = _watch_changes(websocket, lambda path: True, poll_interval=3.0, min_interval=1.0)
     try:
         while True:
-            summaries = await asyncio.to_thread(scan_sessions, DATA_DIR)
+            summaries = await _cached_scan(_SCAN_TTL_MASTER)
             active = [s for s in summaries if s.is_active]
+            # Forget sessions whose files are gone; inactive ones keep their
+            # count so a resumed session only sends what is new
+            if last_event_counts:
+                existing = {s.file_path for s in summaries}
+                for path in [p for p in last_event_counts if p not in existing]:
+                    del last_event_counts[path]
             new_events = []
             all_agents = {}
 
-            for s in active:
+            parsed = await _parse_many([s.file_path for s in active])
+            for s, session in zip(active, parsed):
+                if isinstance(session, BaseException):
+                    logger.error("Failed to parse active session %s", s.file_path, exc_info=session)
+                    continue
                 try:
-                    session = parse(Path(s.file_path))
                     proj = s.project_name
                     prev_count = last_event_counts.get(s.file_path, 0)
 
@@ -601,65 +1134,74 @@ async def ws_master(websocket: WebSocket):
                     else:
                         start = prev_count
 
-                    for evt in session.events[start:]:
-                        d = _redact_event(evt.to_dict())
-                        d["project"] = proj
-                        new_events.append(d)
+                    new_events.extend(_tagged_event(evt, proj) for evt in session.events[start:])
 
                     last_event_counts[s.file_path] = len(session.events)
 
-                    for aid, agent in session.agents.items():
-                        key = f"{proj}:{aid}"
-                        ad = agent.to_dict()
-                        ad["project"] = proj
-                        ad["id"] = key
-                        ad["name"] = f"{proj}/{agent.name}"
-                        all_agents[key] = ad
+                    _add_tagged_agents(all_agents, session, proj)
                 except Exception:
                     logger.exception("Failed to parse active session %s", s.file_path)
                     continue
 
             if new_events:
                 new_events.sort(key=lambda e: e["timestamp"])
-                await websocket.send_json({
+                await _send_json(websocket, {
                     "type": "delta",
                     "events": new_events,
                     "agents": all_agents,
                     "active_count": len(active),
                 })
 
-            await asyncio.sleep(3)
+            try:
+                await anext(changes)
+            except StopAsyncIteration:
+                break
     except WebSocketDisconnect:
         pass
     except Exception:
         logger.exception("WebSocket error in master channel")
+    finally:
+        await changes.aclose()
 
 
 @app.websocket("/ws/dashboard")
 async def ws_dashboard(websocket: WebSocket):
-    """Live updates for the dashboard — polls session list every 10s."""
+    """Live updates for the dashboard — re-sends the session list on changes."""
     await websocket.accept()
+
+    # A new or updated transcript is pushed within seconds, at most one list
+    # every 5s; without changes it still goes out every 10s so the client's
+    # "time ago" labels and active flags stay current
+    changes = _watch_changes(
+        websocket, lambda path: True, poll_interval=10.0, min_interval=5.0, idle_interval=10.0
+    )
     try:
         while True:
-            summaries = await asyncio.to_thread(scan_sessions, DATA_DIR)
-            await websocket.send_json({
-                "type": "sessions",
-                "data": [_redact_summary(s.to_dict()) for s in summaries],
-            })
-            await asyncio.sleep(10)
+            await websocket.send_text(await _dashboard_frame())
+            try:
+                await anext(changes)
+            except StopAsyncIteration:
+                break
     except WebSocketDisconnect:
         pass
     except Exception:
         logger.exception("WebSocket error in dashboard")
+    finally:
+        await changes.aclose()
+
+
+async def _send_json(websocket: WebSocket, data) -> None:
+    """Send *data* as a JSON text frame, encoded with orjson."""
+    await websocket.send_text(orjson.dumps(data).decode())
 
 
-def _file_hash(path: Path) -> str:
-    """Quick hash of file size + mtime for change detection."""
+def _file_stat_key(path: Path) -> tuple[int, int]:
+    """File size + mtime for change detection, or (0, 0) if unreadable."""
     try:
         stat = path.stat()
-        return f"{stat.st_size}:{stat.st_mtime}"
+        return (stat.st_size, stat.st_mtime_ns)
     except OSError:
-        return ""
+        return (0, 0)
 
 
 def _build_arg_parser() -> argparse.ArgumentParser:
@@ -738,8 +1280,7 @@ def main(args: list[str] | None = None) -> None:
         print(f"  LLM: {llm.OPENAI_MODEL} via OpenAI (cloud)")
     else:
         try:
-            import httpx as _hx
-            r = _hx.get(f"{llm.OLLAMA_URL}/api/tags", timeout=3.0)
+            r = httpx.get(f"{llm.OLLAMA_URL}/api/tags", timeout=3.0)
             models = [m["name"] for m in r.json().get("models", [])]
             if llm.OLLAMA_MODEL in models:
                 print(f"  LLM: {llm.OLLAMA_MODEL} via Ollama (ready)")
@@ -750,7 +1291,6 @@ def main(args: list[str] | None = None) -> None:
 
     if not parsed.no_browser:
         # Open browser after a short delay to let server start
-        import threading
         threading.Timer(1.0, lambda: webbrowser.open(browser_url)).start()
 
     uvicorn.run(app, host=host, port=port, log_level="warning")